@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy import desc, insert
+from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 from . import models, schemas
@@ -138,6 +138,46 @@ def create_sentiment_result_segment(
     return db_result
 
 
+def bulk_create_sentiment_results(
+    db: Session,
+    job_id: UUID,
+    sentiment_results: List[Dict[str, Any]]
+) -> int:
+    """
+    Insert every segment of every competitor's sentiment result in one transaction.
+
+    Each entry in sentiment_results is {"competitor_name": ..., "result_json": ...}
+    where result_json is the response from the sentiment service.
+    Returns the number of rows inserted.
+    """
+    rows = []
+    for entry in sentiment_results:
+        competitor_name = entry["competitor_name"]
+        result_json = entry.get("result_json") or {}
+        context = result_json.get('context', competitor_name)
+        metadata = result_json.get('metadata', {})
+
+        for segment in result_json.get('segments', []):
+            rows.append({
+                "job_id": job_id,
+                "competitor_name": competitor_name,
+                "segment_text": segment.get('text', ''),
+                "sentiment": segment.get('sentiment', 'neutral'),
+                "detection_method": segment.get('detection_method', 'unknown'),
+                "detection_details": segment.get('detection_details', ''),
+                "segment_id": str(segment.get('segment-id', segment.get('segment_id', ''))),
+                "start_time": str(segment.get('start', '')),
+                "end_time": str(segment.get('end', '')),
+                "context": context,
+                "metadata_json": metadata
+            })
+
+    if rows:
+        db.execute(insert(models.SentimentResult), rows)
+        db.commit()
+    return len(rows)
+
+
 def get_sentiment_results_by_job(db: Session, job_id: UUID) -> List[models.SentimentResult]:
     """Get all sentiment results for a job."""
     return db.query(models.SentimentResult).filter(
@@ -216,22 +216,23 @@ async def upload_audio(
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
 
-        # Call audio split service
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            with open(tmp_file_path, 'rb') as f:
-                files = {'file': (file.filename, f, file.content_type or 'audio/mpeg')}
-                response = await client.post(f"{settings.SPLIT_URL}/split", files=files)
-                response.raise_for_status()
-                result = response.json()
-
-                # Handle array response format
-                if isinstance(result, list) and len(result) > 0:
-                    split_result = result[0]
-                else:
-                    split_result = result
-
-        # Clean up temporary file
-        os.unlink(tmp_file_path)
+        try:
+            # Call audio split service
+            async with httpx.AsyncClient(timeout=300.0) as client:
+                with open(tmp_file_path, 'rb') as f:
+                    files = {'file': (file.filename, f, file.content_type or 'audio/mpeg')}
+                    response = await client.post(f"{settings.SPLIT_URL}/split", files=files)
+                    response.raise_for_status()
+                    result = response.json()
+
+                    # Handle array response format
+                    if isinstance(result, list) and len(result) > 0:
+                        split_result = result[0]
+                    else:
+                        split_result = result
+        finally:
+            # Clean up temporary file, even if the upstream call failed
+            os.unlink(tmp_file_path)
 
         # Update job with channel URLs (may include base URL)
         left_url = split_result['left_channel_url']
@@ -313,21 +314,22 @@ async def webhook(
                     tmp_file.write(file_response.content)
                     tmp_file_path = tmp_file.name
 
-                # Call audio split service
-                with open(tmp_file_path, 'rb') as f:
-                    files = {'file': (request.filename, f, 'audio/mpeg')}
-                    split_response = await client.post(f"{settings.SPLIT_URL}/split", files=files)
-                    split_response.raise_for_status()
-                    result = split_response.json()
-
-                    # Handle array response format
-                    if isinstance(result, list) and len(result) > 0:
-                        split_result = result[0]
-                    else:
-                        split_result = result
-
-                # Clean up temporary file
-                os.unlink(tmp_file_path)
+                try:
+                    # Call audio split service
+                    with open(tmp_file_path, 'rb') as f:
+                        files = {'file': (request.filename, f, 'audio/mpeg')}
+                        split_response = await client.post(f"{settings.SPLIT_URL}/split", files=files)
+                        split_response.raise_for_status()
+                        result = split_response.json()
+
+                        # Handle array response format
+                        if isinstance(result, list) and len(result) > 0:
+                            split_result = result[0]
+                        else:
+                            split_result = result
+                finally:
+                    # Clean up temporary file, even if the upstream call failed
+                    os.unlink(tmp_file_path)
         else:
             raise HTTPException(status_code=400, detail="file_url is required for webhook")
 
@@ -385,7 +387,10 @@ async def get_jobs(
     """
     jobs = crud.get_jobs(db, skip=skip, limit=limit)
     total = crud.get_jobs_count(db)
-    return schemas.JobListResponse(total=total, jobs=jobs)
+    return schemas.JobListResponse(
+        total=total,
+        jobs=schemas.JOB_LIST_ADAPTER.validate_python(jobs, from_attributes=True)
+    )
 
 
 @app.get("/jobs/{job_id}", response_model=schemas.JobResponse)
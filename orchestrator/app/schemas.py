@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Any
 from datetime import datetime
 from uuid import UUID
@@ -78,3 +78,7 @@ class UploadResponse(BaseModel):
 class WebhookRequest(BaseModel):
     filename: str
     file_url: Optional[str] = None
+
+
+# Module-level adapters so list validators are built once at import, not per request
+JOB_LIST_ADAPTER = TypeAdapter(List[JobResponse])
@@ -1,9 +1,11 @@
 from celery import chain, group
-from celery.exceptions import MaxRetriesExceededError
 import httpx
 import json
+import redis
 import tempfile
 import os
+import secrets
+import sys
 import traceback
 from uuid import UUID
 from datetime import datetime
@@ -14,43 +16,206 @@ from .database import SessionLocal
 from . import crud, models
 from .config import settings
 
+# Transient failures that Celery retries automatically with exponential backoff + jitter
+RETRYABLE_ERRORS = (httpx.HTTPError, OSError)
+
+# Serialized sentiment transcript shared by all competitor tasks of a job
+SENTIMENT_TRANSCRIPT_KEY = "job:{job_id}:sentiment_transcript"
+SENTIMENT_TRANSCRIPT_TTL = 3600  # seconds
+
+# Per-competitor sentiment results of a job, appended as each task finishes and saved by finalize_job
+SENTIMENT_RESULTS_KEY = "job:{job_id}:sentiment_results"
+SENTIMENT_RESULTS_TTL = 86400  # seconds, long enough to retry a failed finalize_job
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 
 def send_notification(job_id: str, filename: str, error_message: str, task_name: str = None):
     """
     Send error notification to notification service.
-    Non-blocking - failures are logged but don't affect the main task.
+    Non-blocking - the HTTP call is handed off to deliver_notification so the
+    failing task returns to the worker immediately.
     """
     try:
-        stack = traceback.format_exc()
-
-        with httpx.Client(timeout=10.0) as client:
-            if task_name:
-                # Task-specific failure
-                client.post(
-                    f"{settings.NOTIFICATION_URL}/notify/task-failed",
-                    json={
-                        "task_name": task_name,
-                        "job_id": job_id,
-                        "error_message": error_message,
-                        "stack_trace": stack
-                    }
-                )
-            else:
-                # Job-level failure
-                client.post(
-                    f"{settings.NOTIFICATION_URL}/notify/job-failed",
-                    json={
-                        "job_id": job_id,
-                        "filename": filename,
-                        "error_message": error_message,
-                        "stack_trace": stack
-                    }
-                )
+        # Capture the stack here, the worker running deliver_notification has no active exception
+        stack = traceback.format_exc() if sys.exc_info()[0] is not None else ""
+
+        if task_name:
+            # Task-specific failure
+            deliver_notification.delay(
+                "/notify/task-failed",
+                {
+                    "task_name": task_name,
+                    "job_id": job_id,
+                    "error_message": error_message,
+                    "stack_trace": stack
+                }
+            )
+        else:
+            # Job-level failure
+            deliver_notification.delay(
+                "/notify/job-failed",
+                {
+                    "job_id": job_id,
+                    "filename": filename,
+                    "error_message": error_message,
+                    "stack_trace": stack
+                }
+            )
     except Exception as e:
         # Don't let notification failures break the main flow
         print(f"Failed to send notification: {str(e)}")
 
 
+@celery_app.task(ignore_result=True)
+def deliver_notification(endpoint: str, payload: dict):
+    """
+    POST a notification payload to the notification service.
+    Fire-and-forget - failures are logged and never retried.
+    """
+    try:
+        with httpx.Client(timeout=httpx.Timeout(2.0)) as client:
+            client.post(f"{settings.NOTIFICATION_URL}{endpoint}", json=payload)
+    except Exception as e:
+        print(f"Failed to send notification: {str(e)}")
+
+
+def _is_final_attempt(task, exc: Exception) -> bool:
+    """True when Celery will not autoretry exc, i.e. the task is about to fail for good."""
+    return not isinstance(exc, RETRYABLE_ERRORS) or task.request.retries >= task.max_retries
+
+
+def _unwrap_transcript(payload: dict) -> dict:
+    """Strip the {"success", "message", "data": {...}} envelope if present."""
+    if isinstance(payload, dict) and isinstance(payload.get('data'), dict):
+        return payload['data']
+    return payload
+
+
+def download_transcript(client: httpx.Client, transcript_path: str) -> dict:
+    """
+    Download a transcript from the Storage Service and return the transcript dict
+    (model, text, segments) regardless of how it was wrapped when stored.
+    """
+    response = client.get(f"{settings.STORAGE_URL}/download/{transcript_path}")
+    response.raise_for_status()
+    # Storage Service wraps the object in DownloadResponse.data
+    stored = response.json().get('data') or {}
+    # Transcripts saved before upload-time unwrapping may carry the transcription envelope
+    return _unwrap_transcript(stored)
+
+
+def build_sentiment_transcript(job_id: str, right_transcript: dict, filename: str) -> bytes:
+    """
+    Build the sentiment service payload (right channel only, with metadata),
+    serialize it and cache it in Redis for the job's competitor tasks.
+    """
+    transcript_for_sentiment = {
+        "metadata": {
+            "ref-id": str(job_id),
+            "used-model": right_transcript.get('model', 'large-v3'),
+            "transcribed-at": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            "company-code": "AUTO",
+            "agent-name": "System",
+            "source-file": filename,
+            "channel": "right"
+        },
+        "text": right_transcript.get('text', ''),
+        "segments": right_transcript.get('segments', [])
+    }
+    payload = json.dumps(transcript_for_sentiment).encode('utf-8')
+
+    try:
+        redis_client.setex(SENTIMENT_TRANSCRIPT_KEY.format(job_id=job_id), SENTIMENT_TRANSCRIPT_TTL, payload)
+    except redis.RedisError as e:
+        # Competitor tasks rebuild the payload on a cache miss
+        print(f"[WARNING] Failed to cache sentiment transcript for job {job_id}: {str(e)}")
+
+    return payload
+
+
+def store_sentiment_result(db, job_id: str, competitor_name: str, sentiment_result: dict):
+    """
+    Queue one competitor's result in Redis for finalize_job to insert in bulk.
+    Falls back to saving it straight to the database if Redis is unavailable.
+    """
+    entry = {"competitor_name": competitor_name, "result_json": sentiment_result}
+    key = SENTIMENT_RESULTS_KEY.format(job_id=job_id)
+    try:
+        pipe = redis_client.pipeline()
+        pipe.rpush(key, json.dumps(entry))
+        pipe.expire(key, SENTIMENT_RESULTS_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[WARNING] Failed to queue sentiment result for {competitor_name}, saving directly: {str(e)}")
+        crud.bulk_create_sentiment_results(db, UUID(job_id), [entry])
+
+
+def load_sentiment_results(job_id: str) -> list:
+    """
+    Read the results queued by store_sentiment_result, keeping the latest
+    entry per competitor in case a task was retried after queuing.
+    """
+    raw = redis_client.lrange(SENTIMENT_RESULTS_KEY.format(job_id=job_id), 0, -1)
+    by_competitor = {}
+    for item in raw:
+        entry = json.loads(item)
+        by_competitor[entry['competitor_name']] = entry
+    return list(by_competitor.values())
+
+
+def get_sentiment_transcript(client: httpx.Client, job_id: str, right_transcript_path: str, filename: str) -> bytes:
+    """Return the cached sentiment payload, rebuilding it from storage on a cache miss."""
+    try:
+        payload = redis_client.get(SENTIMENT_TRANSCRIPT_KEY.format(job_id=job_id))
+        if payload is not None:
+            return payload
+    except redis.RedisError as e:
+        print(f"[WARNING] Failed to read cached sentiment transcript for job {job_id}: {str(e)}")
+
+    right_transcript = download_transcript(client, right_transcript_path)
+    return build_sentiment_transcript(job_id, right_transcript, filename)
+
+
+def stream_multipart_file(fields: dict, file_field: str, filename: str, content_type: str, file_obj):
+    """
+    Build a multipart/form-data body that streams file_obj in chunks.
+
+    httpx reads a file passed via files= fully into memory to size the body;
+    computing Content-Length up front lets the file be streamed from disk.
+
+    Returns:
+        Tuple of (headers, body iterator) to pass to client.post(headers=..., content=...)
+    """
+    boundary = secrets.token_hex(16)
+
+    preamble = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        for name, value in fields.items()
+    )
+    preamble += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'
+    ).encode('utf-8')
+    epilogue = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+
+    file_size = os.fstat(file_obj.fileno()).st_size
+    headers = {
+        'Content-Type': f'multipart/form-data; boundary={boundary}',
+        'Content-Length': str(len(preamble) + file_size + len(epilogue))
+    }
+
+    def body():
+        yield preamble
+        while chunk := file_obj.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+        yield epilogue
+
+    return headers, body()
+
+
 def get_auth_token(max_retries=3):
     """
     Get authentication token from auth service with retry logic.
@@ -80,7 +245,14 @@ def get_auth_token(max_retries=3):
     return None
 
 
-@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+@celery_app.task(
+    bind=True,
+    autoretry_for=RETRYABLE_ERRORS,
+    retry_backoff=2,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=3
+)
 def transcribe_audio_channel(self, job_id: str, channel_url: str, channel_name: str):
     """
     Transcribe a single audio channel with retry logic.
@@ -107,48 +279,48 @@ def transcribe_audio_channel(self, job_id: str, channel_url: str, channel_name:
 
         # Download audio file and process transcription
         with httpx.Client(timeout=300.0) as client:
-            audio_response = client.get(channel_url)
-            audio_response.raise_for_status()
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_audio:
-                tmp_audio.write(audio_response.content)
-                tmp_audio_path = tmp_audio.name
-
-            # Call transcription service with optimal Whisper parameters
-            with open(tmp_audio_path, 'rb') as audio_file:
-                files = {'audio_file': ('audio.mp3', audio_file, 'audio/mpeg')}
-                data = {
-                    'whisper_model': 'large-v3',
-                    'compression_ratio_threshold': '1.8',
-                    'temperature': '0',
-                    'logprob_threshold': '-0.8',
-                    'no_speech_threshold': '0.7',
-                    'condition_on_previous_text': 'false',
-                    'beam_size': '1',
-                    'best_of': '1',
-                    'word_timestamps': 'true',
-                    'language': 'en'
-                }
-                headers = {'Authorization': f'Bearer {token}'}
-
-                transcription_response = client.post(
-                    f"{settings.TRANSCRIPTION_URL}/api/v1/transcriptions/",
-                    files=files,
-                    data=data,
-                    headers=headers
-                )
-                transcription_response.raise_for_status()
-                result = transcription_response.json()
-
-                # Handle array response format
-                if isinstance(result, list) and len(result) > 0:
-                    transcript_data = result[0].get('data', result[0])
-                else:
-                    transcript_data = result
+            # Stream audio to a temporary file
+            with client.stream('GET', channel_url) as audio_response:
+                audio_response.raise_for_status()
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_audio:
+                    for chunk in audio_response.iter_bytes(UPLOAD_CHUNK_SIZE):
+                        tmp_audio.write(chunk)
+                    tmp_audio_path = tmp_audio.name
 
-            # Clean up temporary audio file
-            os.unlink(tmp_audio_path)
+            try:
+                # Call transcription service with optimal Whisper parameters
+                with open(tmp_audio_path, 'rb') as audio_file:
+                    data = {
+                        'whisper_model': 'large-v3',
+                        'compression_ratio_threshold': '1.8',
+                        'temperature': '0',
+                        'logprob_threshold': '-0.8',
+                        'no_speech_threshold': '0.7',
+                        'condition_on_previous_text': 'false',
+                        'beam_size': '1',
+                        'best_of': '1',
+                        'word_timestamps': 'true',
+                        'language': 'en'
+                    }
+                    headers, body = stream_multipart_file(data, 'audio_file', 'audio.mp3', 'audio/mpeg', audio_file)
+                    headers['Authorization'] = f'Bearer {token}'
+
+                    transcription_response = client.post(
+                        f"{settings.TRANSCRIPTION_URL}/api/v1/transcriptions/",
+                        content=body,
+                        headers=headers
+                    )
+                    transcription_response.raise_for_status()
+                    result = transcription_response.json()
+
+                    # Handle array response format and store only the transcript itself
+                    if isinstance(result, list) and len(result) > 0:
+                        transcript_data = _unwrap_transcript(result[0])
+                    else:
+                        transcript_data = _unwrap_transcript(result)
+            finally:
+                # Clean up temporary audio file, even if transcription failed
+                os.unlink(tmp_audio_path)
 
             # Save transcript to Storage Service
             transcript_path = f"transcripts/{job_id}/{channel_name}_transcript.json"
@@ -171,14 +343,11 @@ def transcribe_audio_channel(self, job_id: str, channel_url: str, channel_name:
         return transcript_path
 
     except Exception as e:
-        db.close()
-        # Retry with exponential backoff
-        try:
-            raise self.retry(exc=e, countdown=2 ** self.request.retries)
-        except MaxRetriesExceededError:
+        # Celery retries RETRYABLE_ERRORS itself; only record the final failure
+        if _is_final_attempt(self, e):
             # Get job details for notification
             job = crud.get_job(db, UUID(job_id))
-            error_msg = f"Transcription failed for {channel_name} channel after 3 retries: {str(e)}"
+            error_msg = f"Transcription failed for {channel_name} channel after {self.request.retries} retries: {str(e)}"
 
             # Update job status to failed
             crud.update_job_status(
@@ -192,12 +361,19 @@ def transcribe_audio_channel(self, job_id: str, channel_url: str, channel_name:
             if job:
                 send_notification(job_id, job.filename, error_msg, f"transcribe_audio_channel ({channel_name})")
 
-            raise
+        raise
     finally:
         db.close()
 
 
-@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+@celery_app.task(
+    bind=True,
+    autoretry_for=RETRYABLE_ERRORS,
+    retry_backoff=2,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=3
+)
 def analyze_competitors(self, job_id: str, left_transcript_path: str, right_transcript_path: str):
     """
     Analyze transcripts for competitor mentions with retry logic.
@@ -218,25 +394,8 @@ def analyze_competitors(self, job_id: str, left_transcript_path: str, right_tran
 
         # Download both transcripts from Storage Service
         with httpx.Client(timeout=30.0) as client:
-            left_response = client.get(f"{settings.STORAGE_URL}/download/{left_transcript_path}")
-            left_response.raise_for_status()
-            left_result = left_response.json()
-            # Handle nested data structure: data.data.data
-            left_data = left_result.get('data', {})
-            if isinstance(left_data, dict) and 'data' in left_data:
-                left_transcript = left_data.get('data', {})
-            else:
-                left_transcript = left_data
-
-            right_response = client.get(f"{settings.STORAGE_URL}/download/{right_transcript_path}")
-            right_response.raise_for_status()
-            right_result = right_response.json()
-            # Handle nested data structure: data.data.data
-            right_data = right_result.get('data', {})
-            if isinstance(right_data, dict) and 'data' in right_data:
-                right_transcript = right_data.get('data', {})
-            else:
-                right_transcript = right_data
+            left_transcript = download_transcript(client, left_transcript_path)
+            right_transcript = download_transcript(client, right_transcript_path)
 
             # Combine transcript texts
             combined_text = left_transcript.get('text', '') + ' ' + right_transcript.get('text', '')
@@ -250,20 +409,22 @@ def analyze_competitors(self, job_id: str, left_transcript_path: str, right_tran
             result = analysis_response.json()
             competitors_found = result.get('competitors_found', [])
 
+            # Prepare the sentiment payload once for every competitor task
+            if competitors_found:
+                job = crud.get_job(db, UUID(job_id))
+                build_sentiment_transcript(job_id, right_transcript, job.filename if job else "unknown")
+
         # Update job record with competitors
         crud.update_job_competitors(db, UUID(job_id), competitors_found)
 
         return competitors_found
 
     except Exception as e:
-        db.close()
-        # Retry with exponential backoff
-        try:
-            raise self.retry(exc=e, countdown=2 ** self.request.retries)
-        except MaxRetriesExceededError:
+        # Celery retries RETRYABLE_ERRORS itself; only record the final failure
+        if _is_final_attempt(self, e):
             # Get job details for notification
             job = crud.get_job(db, UUID(job_id))
-            error_msg = f"Competitor analysis failed after 3 retries: {str(e)}"
+            error_msg = f"Competitor analysis failed after {self.request.retries} retries: {str(e)}"
 
             # Update job status to failed
             crud.update_job_status(
@@ -277,12 +438,19 @@ def analyze_competitors(self, job_id: str, left_transcript_path: str, right_tran
             if job:
                 send_notification(job_id, job.filename, error_msg, "analyze_competitors")
 
-            raise
+        raise
     finally:
         db.close()
 
 
-@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+@celery_app.task(
+    bind=True,
+    autoretry_for=RETRYABLE_ERRORS,
+    retry_backoff=2,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=3
+)
 def analyze_sentiment_for_competitor(self, previous_result, competitor_name: str, left_transcript_path: str, right_transcript_path: str, filename: str = "unknown"):
     """
     Analyze sentiment for a specific competitor with retry logic.
@@ -297,7 +465,7 @@ def analyze_sentiment_for_competitor(self, previous_result, competitor_name: str
         filename: Original audio filename
 
     Returns:
-        Dict with job_id and paths to pass to next task in chain
+        Dict with job_id, paths and this competitor's status to pass to next task in chain
     """
     db = SessionLocal()
 
@@ -323,122 +491,52 @@ def analyze_sentiment_for_competitor(self, previous_result, competitor_name: str
             completed_competitors=str(completed)
         )
 
-        # Download ONLY the right channel transcript for sentiment analysis
+        # Right channel transcript prepared once per job by analyze_competitors
         with httpx.Client(timeout=120.0) as client:
-            right_response = client.get(f"{settings.STORAGE_URL}/download/{right_transcript_path}")
-            right_response.raise_for_status()
-            right_result = right_response.json()
-
-            # DEBUG: Log the raw response from storage
-            print(f"[DEBUG] Raw storage response for right channel: {json.dumps(right_result, indent=2)[:1000]}")
-
-            # Handle nested data structure: data.data.data
-            right_data = right_result.get('data', {})
-            if isinstance(right_data, dict) and 'data' in right_data:
-                right_transcript = right_data.get('data', {})
-            else:
-                right_transcript = right_data
-
-            # DEBUG: Log what we received from storage
-            print(f"[DEBUG] Right transcript data received from storage: {json.dumps(right_transcript, indent=2)[:1000]}")
-            print(f"[DEBUG] Right transcript has 'text' key: {'text' in right_transcript}")
-            print(f"[DEBUG] Right transcript 'text' value: {right_transcript.get('text', 'MISSING')[:200]}")
-            print(f"[DEBUG] Right transcript has 'segments' key: {'segments' in right_transcript}")
-            print(f"[DEBUG] Right transcript 'segments' count: {len(right_transcript.get('segments', []))}")
-
-            # Use only right channel for sentiment analysis with metadata
-            transcript_for_sentiment = {
-                "metadata": {
-                    "ref-id": str(job_id),
-                    "used-model": right_transcript.get('model', 'large-v3'),
-                    "transcribed-at": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
-                    "company-code": "AUTO",
-                    "agent-name": "System",
-                    "source-file": filename,
-                    "channel": "right"
-                },
-                "text": right_transcript.get('text', ''),
-                "segments": right_transcript.get('segments', [])
-            }
-
-            # Create temporary file for the transcript JSON
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as transcript_file:
-                json.dump(transcript_for_sentiment, transcript_file, indent=2)
-                transcript_file_path = transcript_file.name
+            transcript_payload = get_sentiment_transcript(client, job_id, right_transcript_path, filename)
 
             # Call sentiment analysis service (matching n8n format)
             sentiment_url = f"{settings.SENTIMENT_URL}/analyze/contextual/file"
             print(f"[DEBUG] Sending sentiment analysis request to: {sentiment_url}")
             print(f"[DEBUG] Competitor: {competitor_name}")
-            print(f"[DEBUG] Using RIGHT CHANNEL ONLY for sentiment analysis")
-            print(f"[DEBUG] Transcript metadata: {transcript_for_sentiment.get('metadata', {})}")
-            print(f"[DEBUG] Transcript text length: {len(transcript_for_sentiment.get('text', ''))}")
-            print(f"[DEBUG] Transcript segments count: {len(transcript_for_sentiment.get('segments', []))}")
-
-            with open(transcript_file_path, 'rb') as trans_file:
-                # Match n8n format: context as form field (string), file as binary upload
-                files = {
-                    'file': ('transcript.json', trans_file, 'application/json')
-                }
-                data = {
-                    'context': competitor_name  # Send competitor name as plain text context
-                }
-
-                sentiment_response = client.post(sentiment_url, files=files, data=data)
+            print(f"[DEBUG] Transcript payload size: {len(transcript_payload)} bytes")
 
-                print(f"[DEBUG] Sentiment API response status: {sentiment_response.status_code}")
-                print(f"[DEBUG] Sentiment API response headers: {dict(sentiment_response.headers)}")
-
-                sentiment_response.raise_for_status()
-                result = sentiment_response.json()
+            # Match n8n format: context as form field (string), file as binary upload
+            files = {
+                'file': ('transcript.json', transcript_payload, 'application/json')
+            }
+            data = {
+                'context': competitor_name  # Send competitor name as plain text context
+            }
 
-                print(f"[DEBUG] Sentiment API response: {json.dumps(result, indent=2)[:500]}")
+            sentiment_response = client.post(sentiment_url, files=files, data=data)
 
-                # Handle array response format (empty array returns no results)
-                if isinstance(result, list):
-                    if len(result) > 0:
-                        sentiment_result = result[0]
-                    else:
-                        # Empty array - no sentiment detected
-                        sentiment_result = {
-                            "competitor": competitor_name,
-                            "overall_sentiment": "neutral",
-                            "message": "No sentiment analysis results returned"
-                        }
-                else:
-                    sentiment_result = result
+            print(f"[DEBUG] Sentiment API response status: {sentiment_response.status_code}")
+            print(f"[DEBUG] Sentiment API response headers: {dict(sentiment_response.headers)}")
 
-            # Clean up temporary file
-            os.unlink(transcript_file_path)
+            sentiment_response.raise_for_status()
+            result = sentiment_response.json()
 
-        # Save each segment as an individual database record
-        segments = sentiment_result.get('segments', [])
-        context = sentiment_result.get('context', competitor_name)
-        metadata = sentiment_result.get('metadata', {})
+            print(f"[DEBUG] Sentiment API response: {json.dumps(result, indent=2)[:500]}")
 
-        print(f"[DEBUG] Saving {len(segments)} sentiment segments for {competitor_name}")
+            # Handle array response format (empty array returns no results)
+            if isinstance(result, list):
+                if len(result) > 0:
+                    sentiment_result = result[0]
+                else:
+                    # Empty array - no sentiment detected
+                    sentiment_result = {
+                        "competitor": competitor_name,
+                        "overall_sentiment": "neutral",
+                        "message": "No sentiment analysis results returned"
+                    }
+            else:
+                sentiment_result = result
 
-        for segment in segments:
-            try:
-                crud.create_sentiment_result_segment(
-                    db,
-                    job_id=UUID(job_id),
-                    competitor_name=competitor_name,
-                    segment_text=segment.get('text', ''),
-                    sentiment=segment.get('sentiment', 'neutral'),
-                    detection_method=segment.get('detection_method', 'unknown'),
-                    detection_details=segment.get('detection_details', ''),
-                    segment_id=str(segment.get('segment-id', segment.get('segment_id', ''))),
-                    start_time=str(segment.get('start', '')),
-                    end_time=str(segment.get('end', '')),
-                    context=context,
-                    metadata_json=metadata
-                )
-            except Exception as seg_error:
-                print(f"[ERROR] Failed to save segment {segment.get('segment-id', 'unknown')}: {str(seg_error)}")
-                # Continue saving other segments even if one fails
+        # Queue the result outside the chain; finalize_job inserts all competitors in one commit
+        store_sentiment_result(db, job_id, competitor_name, sentiment_result)
 
-        print(f"[DEBUG] Successfully saved {len(segments)} segments for {competitor_name}")
+        print(f"[DEBUG] Collected {len(sentiment_result.get('segments', []))} sentiment segments for {competitor_name}")
 
         # Update completed count
         crud.update_job_progress(
@@ -454,30 +552,62 @@ def analyze_sentiment_for_competitor(self, previous_result, competitor_name: str
             "left_path": left_transcript_path,
             "right_path": right_transcript_path,
             "filename": filename,
-            "last_result": sentiment_result
+            "last_result": {"competitor": competitor_name, "status": "completed"}
         }
 
     except Exception as e:
-        db.close()
-        # Retry with exponential backoff
-        try:
-            raise self.retry(exc=e, countdown=2 ** self.request.retries)
-        except MaxRetriesExceededError:
-            # Log error but don't fail the entire job
-            print(f"Sentiment analysis failed for {competitor_name} after 3 retries: {str(e)}")
-            # Don't save error results as segments - just log and continue
-            # Return context for chain continuation even on error
-            return {
-                "job_id": job_id,
-                "left_path": left_transcript_path,
-                "right_path": right_transcript_path,
-                "filename": filename,
-                "last_result": {"error": str(e), "competitor": competitor_name}
-            }
+        # Let Celery retry transient errors
+        if not _is_final_attempt(self, e):
+            raise
+
+        # Log error but don't fail the entire job
+        print(f"Sentiment analysis failed for {competitor_name} after {self.request.retries} retries: {str(e)}")
+        # Don't save error results as segments - just log and continue
+        # Return context for chain continuation even on error
+        return {
+            "job_id": job_id,
+            "left_path": left_transcript_path,
+            "right_path": right_transcript_path,
+            "filename": filename,
+            "last_result": {"error": str(e), "competitor": competitor_name}
+        }
     finally:
         db.close()
 
 
+def _save_sentiment_segments(db, job_id: str, sentiment_results: list):
+    """
+    Degraded fallback for finalize_job: insert segments one by one so a single
+    bad row doesn't discard the rest.
+    """
+    for entry in sentiment_results:
+        competitor_name = entry['competitor_name']
+        result_json = entry.get('result_json') or {}
+        context = result_json.get('context', competitor_name)
+        metadata = result_json.get('metadata', {})
+
+        for segment in result_json.get('segments', []):
+            try:
+                crud.create_sentiment_result_segment(
+                    db,
+                    job_id=UUID(job_id),
+                    competitor_name=competitor_name,
+                    segment_text=segment.get('text', ''),
+                    sentiment=segment.get('sentiment', 'neutral'),
+                    detection_method=segment.get('detection_method', 'unknown'),
+                    detection_details=segment.get('detection_details', ''),
+                    segment_id=str(segment.get('segment-id', segment.get('segment_id', ''))),
+                    start_time=str(segment.get('start', '')),
+                    end_time=str(segment.get('end', '')),
+                    context=context,
+                    metadata_json=metadata
+                )
+            except Exception as seg_error:
+                db.rollback()
+                print(f"[ERROR] Failed to save segment {segment.get('segment-id', 'unknown')}: {str(seg_error)}")
+                # Continue saving other segments even if one fails
+
+
 @celery_app.task
 def finalize_job(previous_result):
     """
@@ -497,7 +627,27 @@ def finalize_job(previous_result):
             job_id = previous_result
 
         print(f"[DEBUG] Finalizing job {job_id}")
-        print(f"[DEBUG] Previous result: {previous_result}")
+
+        # Save all competitors' segments in a single transaction. The queued results
+        # stay in Redis until saved, so a retried finalize_job can still insert them.
+        sentiment_results = load_sentiment_results(job_id)
+        if sentiment_results:
+            try:
+                saved = crud.bulk_create_sentiment_results(db, UUID(job_id), sentiment_results)
+                print(f"[DEBUG] Saved {saved} sentiment segments for job {job_id}")
+            except Exception as bulk_error:
+                print(f"[ERROR] Bulk insert failed, falling back to per-segment inserts: {str(bulk_error)}")
+                db.rollback()
+                _save_sentiment_segments(db, job_id, sentiment_results)
+
+        # Cached sentiment payload and queued results are no longer needed (the TTL covers failures here)
+        try:
+            redis_client.delete(
+                SENTIMENT_TRANSCRIPT_KEY.format(job_id=job_id),
+                SENTIMENT_RESULTS_KEY.format(job_id=job_id)
+            )
+        except redis.RedisError:
+            pass
 
         # Update progress to 100%
         crud.update_job_progress(db, UUID(job_id), "Finalizing job", "100%")
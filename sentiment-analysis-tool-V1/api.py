@@ -7,25 +7,36 @@ FastAPI-based REST API for sentiment analysis services.
 
 import os
 import sys
+import asyncio
+import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, FrozenSet, Tuple
+from contextlib import asynccontextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel, Field
+import aiofiles
+import aiofiles.os
+import orjson
+from cachetools import TTLCache
 import uvicorn
 
 # Import sentiment analysis functions
 from sentiment_analysis_tool import (
-    analyze_overall_sentiment,
-    analyze_contextual_sentiment,
+    analyze_overall_sentiment_batch,
+    load_sentiment_pipeline,
+    analyze_contextual_sentiment_dict,
     validate_json_against_schema,
-    load_patterns_from_file,
+    load_pattern_file,
+    pattern_file_version,
     BASE_DIR,
     NEGATIVE_PATTERNS_FILE,
-    POSITIVE_PATTERNS_FILE
+    POSITIVE_PATTERNS_FILE,
+    PATTERN_TOMBSTONE_PREFIX
 )
 
 # Configure logging
@@ -35,6 +46,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sentiment_api")
 
+# Transcript schema used to validate contextual requests
+TRANSCRIPT_SCHEMA_PATH = os.path.join(BASE_DIR, "transcript-schema.json")
+
+# Largest request body accepted by the analysis endpoints (default 10MB)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+
 # Pydantic models for request/response
 class OverallSentimentRequest(BaseModel):
     text: str = Field(..., description="Text content to analyze")
@@ -97,24 +114,181 @@ class PatternListRequest(BaseModel):
 # Global variable for models (loaded at startup)
 models_loaded = False
 
+class OverallBatcher:
+    """
+    Coalesces concurrent overall sentiment requests into batches.
+
+    Requests arriving within max_wait_ms of each other (up to max_batch) are
+    grouped by model and analyzed with a single tokenizer/pipeline run.
+    """
+
+    def __init__(self, max_batch: int = 16, max_wait_ms: float = 10.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+
+    async def submit(self, text: str, model: str) -> Dict[str, Any]:
+        """Queue text for analysis and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, model, future))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        """Wait for one request, then gather more until the batch is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+
+            by_model: Dict[str, List[tuple]] = {}
+            for text, model, future in items:
+                by_model.setdefault(model, []).append((text, future))
+
+            for model, group in by_model.items():
+                texts = [text for text, _ in group]
+                try:
+                    results = await asyncio.to_thread(analyze_overall_sentiment_batch, texts, model)
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(group, results):
+                    if not future.done():
+                        future.set_result(result)
+
+overall_batcher = OverallBatcher(
+    max_batch=int(os.environ.get("OVERALL_BATCH_SIZE", 16)),
+    max_wait_ms=float(os.environ.get("OVERALL_BATCH_WAIT_MS", 10))
+)
+
+# Results for identical inputs, so UI retries and dashboard refreshes skip inference.
+# Contextual keys include the pattern files' versions, since rule-based detection depends on them.
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", 4096))
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", 3600))
+_overall_cache: TTLCache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+_contextual_cache: TTLCache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+def _pattern_files_version() -> tuple:
+    """(mtime_ns, size) of both pattern files, see pattern_file_version."""
+    return (pattern_file_version(POSITIVE_PATTERNS_FILE), pattern_file_version(NEGATIVE_PATTERNS_FILE))
+
+async def analyze_overall_cached(text: str, model: str) -> Dict[str, Any]:
+    """Overall sentiment for text, served from the result cache when possible."""
+    key = hashlib.blake2b(model.encode() + b'|' + text.encode('utf-8'), digest_size=16).digest()
+    result = _overall_cache.get(key)
+    if result is None:
+        result = await overall_batcher.submit(text, model)
+        _overall_cache[key] = result
+    return result
+
+async def analyze_contextual_cached(transcript_dict: Dict[str, Any], context: str) -> Dict[str, Any]:
+    """Contextual sentiment for a transcript, served from the result cache when possible."""
+    payload = orjson.dumps(transcript_dict, option=orjson.OPT_SORT_KEYS)
+    key = (context, _pattern_files_version(), hashlib.blake2b(payload, digest_size=16).digest())
+    result = _contextual_cache.get(key)
+    if result is None:
+        # Inference runs on the worker pool so the event loop keeps serving other requests
+        result = await asyncio.get_running_loop().run_in_executor(
+            app.state.inference_pool, analyze_contextual_sentiment_dict, transcript_dict, context
+        )
+        _contextual_cache[key] = result
+    return result
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle events for the API"""
     # Startup
     logger.info("Starting Sentiment Analysis API...")
-    logger.info("Models will be loaded on first request")
+    # Load the overall sentiment models up front so the first request doesn't pay for it
+    preload = [m.strip() for m in os.environ.get("PRELOAD_MODELS", "roberta,distilbert").split(",") if m.strip()]
+    for model_name in preload:
+        await asyncio.to_thread(load_sentiment_pipeline, model_name)
+    logger.info(f"Preloaded sentiment models: {', '.join(preload) or 'none'}")
+    # Contextual requests share one Llama 2 instance and take turns on it, so keep the default pool small
+    app.state.inference_pool = ThreadPoolExecutor(
+        max_workers=int(os.environ.get("INFERENCE_WORKERS", 2)),
+        thread_name_prefix="inference"
+    )
+    overall_batcher.start()
     yield
     # Shutdown
     logger.info("Shutting down Sentiment Analysis API...")
+    await overall_batcher.stop()
+    app.state.inference_pool.shutdown(wait=False, cancel_futures=True)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Sentiment Analysis API",
     description="Advanced sentiment analysis using DistilBERT, RoBERTa, and Llama 2 models",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+class UploadSizeLimitMiddleware:
+    """
+    Reject /analyze/* request bodies over MAX_UPLOAD_BYTES while they are received.
+
+    A declared Content-Length is checked up front; otherwise (e.g. chunked
+    requests) bytes are counted as they arrive and the request fails with 413
+    as soon as the limit is crossed, before the rest is read or spooled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/analyze/"):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body too large (max {MAX_UPLOAD_BYTES} bytes)"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+            response = JSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_UPLOAD_BYTES:
+                    # Raised from inside body parsing; FastAPI re-raises HTTPException as-is
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint - API health check"""
@@ -151,17 +325,8 @@ async def analyze_overall(request: OverallSentimentRequest):
                 detail="Invalid model. Must be 'distilbert' or 'roberta'"
             )
 
-        # Create temporary file for analysis
-        temp_file = Path("/tmp/temp_analysis.txt")
-        temp_file.write_text(request.text, encoding='utf-8')
-
-        # Run analysis
-        result = analyze_overall_sentiment(str(temp_file), request.model)
-
-        # Clean up
-        temp_file.unlink()
-
-        return result
+        # Run analysis (cached, batched with concurrent requests)
+        return await analyze_overall_cached(request.text, request.model)
 
     except Exception as e:
         logger.error(f"Error in overall sentiment analysis: {e}", exc_info=True)
@@ -197,42 +362,17 @@ async def analyze_contextual(request: ContextualSentimentRequest | List[Contextu
             )
 
         # Convert Pydantic model to dict format expected by analysis function
-        import json
-        transcript_dict = {
-            "text": actual_request.transcript.text,
-            "segments": [
-                {
-                    "id": seg.id,
-                    "start": seg.start,
-                    "end": seg.end,
-                    "text": seg.text
-                }
-                for seg in actual_request.transcript.segments
-            ]
-        }
-
-        if actual_request.transcript.metadata:
-            transcript_dict["metadata"] = actual_request.transcript.metadata
+        transcript_dict = actual_request.transcript.model_dump(exclude_none=True)
 
         # Validate against schema
-        schema_path = os.path.join(BASE_DIR, "transcript-schema.json")
-        if not validate_json_against_schema(transcript_dict, schema_path):
+        if not validate_json_against_schema(transcript_dict, TRANSCRIPT_SCHEMA_PATH):
             raise HTTPException(
                 status_code=400,
                 detail="Invalid transcript format"
             )
 
-        # Create temporary file for analysis
-        temp_file = Path("/tmp/temp_transcript.json")
-        temp_file.write_text(json.dumps(transcript_dict), encoding='utf-8')
-
         # Run analysis
-        result = analyze_contextual_sentiment(str(temp_file), actual_request.context)
-
-        # Clean up
-        temp_file.unlink()
-
-        return result
+        return await analyze_contextual_cached(transcript_dict, actual_request.context)
 
     except HTTPException:
         raise
@@ -262,21 +402,13 @@ async def analyze_overall_file(
             )
 
         # Read file content
-        content = await file.read()
-        text = content.decode('utf-8')
-
-        # Create temporary file for analysis
-        temp_file = Path("/tmp/temp_upload.txt")
-        temp_file.write_text(text, encoding='utf-8')
-
-        # Run analysis
-        result = analyze_overall_sentiment(str(temp_file), model)
+        text = (await file.read()).decode('utf-8')
 
-        # Clean up
-        temp_file.unlink()
-
-        return result
+        # Run analysis (cached, batched with concurrent requests)
+        return await analyze_overall_cached(text, model)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in file upload analysis: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -293,9 +425,7 @@ async def analyze_contextual_file(
     - **context**: Context word to analyze sentiment for
     """
     try:
-        logger.info(f"========== NEW REQUEST ==========")
-        logger.info(f"Contextual sentiment analysis from file: {file.filename}")
-        logger.info(f"Context: {context}")
+        logger.info("Contextual sentiment analysis from file: %s (context=%s, %s bytes)", file.filename, context, file.size)
 
         # Validate context
         if not context or not context.strip():
@@ -304,19 +434,10 @@ async def analyze_contextual_file(
                 detail="Context word is required"
             )
 
-        # Read and validate file content
-        content = await file.read()
-        logger.info(f"Received file size: {len(content)} bytes")
-
-        import json
+        # Parse straight from the spooled upload instead of copying it into a str first
         try:
-            data = json.loads(content.decode('utf-8'))
-            logger.info(f"Parsed JSON type: {type(data)}")
-
-            if isinstance(data, list):
-                logger.info(f"Data is array with {len(data)} elements")
-            else:
-                logger.info(f"Data is object with keys: {list(data.keys()) if isinstance(data, dict) else 'not a dict'}")
+            await file.seek(0)
+            data = await asyncio.to_thread(lambda: orjson.loads(file.file.read()))
 
             # Handle array-wrapped format: [{ transcript }] -> { transcript }
             if isinstance(data, list):
@@ -326,12 +447,11 @@ async def analyze_contextual_file(
                         detail="Empty array in JSON file"
                     )
                 transcript_dict = data[0]
-                logger.info(f"Unwrapped array, transcript_dict keys: {list(transcript_dict.keys())}")
+                logger.debug("Unwrapped array of %d elements", len(data))
             else:
                 transcript_dict = data
-                logger.info(f"Using data directly, keys: {list(transcript_dict.keys())}")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}")
             raise HTTPException(
                 status_code=400,
@@ -339,32 +459,20 @@ async def analyze_contextual_file(
             )
 
         # Log the transcript structure for debugging
-        logger.info(f"Final transcript_dict keys: {list(transcript_dict.keys())}")
-        logger.info(f"Has 'text' key: {'text' in transcript_dict}")
-        logger.info(f"Has 'segments' key: {'segments' in transcript_dict}")
-        if 'segments' in transcript_dict:
-            logger.info(f"Transcript has {len(transcript_dict.get('segments', []))} segments")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transcript keys: %s", list(transcript_dict.keys()))
+            logger.debug("Transcript has %d segments", len(transcript_dict.get('segments', [])))
 
         # Validate against schema
-        schema_path = os.path.join(BASE_DIR, "transcript-schema.json")
-        if not validate_json_against_schema(transcript_dict, schema_path):
+        if not validate_json_against_schema(transcript_dict, TRANSCRIPT_SCHEMA_PATH):
             logger.error(f"Schema validation failed for transcript with keys: {list(transcript_dict.keys())}")
             raise HTTPException(
                 status_code=400,
                 detail="Invalid transcript format - check server logs for details"
             )
 
-        # Create temporary file for analysis
-        temp_file = Path("/tmp/temp_upload.json")
-        temp_file.write_text(json.dumps(transcript_dict), encoding='utf-8')
-
         # Run analysis
-        result = analyze_contextual_sentiment(str(temp_file), context)
-
-        # Clean up
-        temp_file.unlink()
-
-        return result
+        return await analyze_contextual_cached(transcript_dict, context)
 
     except HTTPException:
         raise
@@ -376,11 +484,132 @@ async def analyze_contextual_file(
 # Pattern Management Endpoints
 # ---------------------------
 
+# Parsed pattern files keyed by path: ((mtime_ns, size), patterns, pattern set, tombstone count).
+# Re-read only when the file changes on disk (e.g. edited through the volume mount).
+_pattern_cache: Dict[str, Tuple[Tuple[int, int], List[str], FrozenSet[str], int]] = {}
+
+# Deletes append a tombstone line; the file is rewritten once tombstones exceed
+# max(PATTERN_COMPACT_MIN_TOMBSTONES, half the live patterns)
+PATTERN_COMPACT_MIN_TOMBSTONES = 64
+
+def _get_patterns_cached(path: Path) -> Tuple[List[str], FrozenSet[str], int]:
+    """Return (patterns, pattern set, tombstones) for a pattern file, re-parsing only if it changed."""
+    version = pattern_file_version(path)
+
+    cached = _pattern_cache.get(str(path))
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2], cached[3]
+
+    patterns, tombstones = load_pattern_file(path)
+    pattern_set = frozenset(patterns)
+    _pattern_cache[str(path)] = (version, patterns, pattern_set, tombstones)
+    return patterns, pattern_set, tombstones
+
+def _invalidate_patterns_cached(path: Path) -> None:
+    """
+    Drop a pattern file's cached parse after writing it.
+
+    The in-memory list was built before the write, so it can't be stamped with
+    the file's new version; the next read re-parses the file instead.
+    """
+    _pattern_cache.pop(str(path), None)
+
+# Serializes each pattern file's read-modify-write within this process, so
+# concurrent adds/deletes never write from a stale list
+_pattern_locks: Dict[str, asyncio.Lock] = {}
+
+def _pattern_lock(path: Path) -> asyncio.Lock:
+    """Return the lock guarding mutations of a pattern file."""
+    lock = _pattern_locks.get(str(path))
+    if lock is None:
+        lock = _pattern_locks[str(path)] = asyncio.Lock()
+    return lock
+
+def _validate_pattern(pattern: str) -> None:
+    """Reject patterns the pattern file format would read as comments or tombstones."""
+    if pattern.startswith(('#', PATTERN_TOMBSTONE_PREFIX)):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pattern cannot start with '#' or '{PATTERN_TOMBSTONE_PREFIX}'"
+        )
+
+async def _write_lines(path: Path, label: str, patterns: List[str]) -> None:
+    # Build the whole file once so it goes out in a single write
+    body = (
+        f"# {label} sentiment patterns\n"
+        "# One pattern per line\n"
+        "# Lines starting with # are comments and will be ignored\n\n"
+        + "".join(f"{p}\n" for p in patterns)
+    )
+    async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+        await f.write(body)
+
+async def _write_patterns_file(path: Path, label: str, patterns: List[str]) -> None:
+    """
+    Rewrite a pattern file with its header and the given patterns (drops tombstones).
+
+    Writes to a sibling temp file and renames it over the original so readers
+    never see a truncated file. When the pattern file is bind-mounted on its
+    own (docker-compose), the rename fails and we fall back to rewriting in place.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    await _write_lines(tmp_path, label, patterns)
+    try:
+        await aiofiles.os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Atomic replace of {path} failed ({e}), rewriting in place")
+        await aiofiles.os.remove(tmp_path)
+        await _write_lines(path, label, patterns)
+
+async def _add_pattern(path: Path, pattern: str) -> List[str]:
+    """
+    Append a pattern to its file, loading the file at most once.
+    Returns the updated pattern list.
+    """
+    async with _pattern_lock(path):
+        patterns, pattern_set, _ = await asyncio.to_thread(_get_patterns_cached, path)
+
+        # Check if pattern already exists
+        if pattern in pattern_set:
+            raise HTTPException(status_code=400, detail="Pattern already exists")
+
+        # Add new pattern to file
+        async with aiofiles.open(path, 'a', encoding='utf-8') as f:
+            await f.write(f"\n{pattern}")
+
+        _invalidate_patterns_cached(path)
+    return patterns + [pattern]
+
+async def _delete_pattern(path: Path, label: str, pattern: str) -> int:
+    """
+    Delete a pattern by appending a tombstone, compacting the file when
+    tombstones pile up. Returns the number of remaining patterns.
+    """
+    async with _pattern_lock(path):
+        patterns, pattern_set, tombstones = await asyncio.to_thread(_get_patterns_cached, path)
+
+        # Check if pattern exists
+        if pattern not in pattern_set:
+            raise HTTPException(status_code=404, detail="Pattern not found")
+
+        # Remove the pattern
+        patterns = [p for p in patterns if p != pattern]
+        tombstones += 1
+
+        if tombstones > max(PATTERN_COMPACT_MIN_TOMBSTONES, len(patterns) // 2):
+            await _write_patterns_file(path, label, patterns)
+        else:
+            async with aiofiles.open(path, 'a', encoding='utf-8') as f:
+                await f.write(f"\n{PATTERN_TOMBSTONE_PREFIX}{pattern}")
+
+        _invalidate_patterns_cached(path)
+    return len(patterns)
+
 @app.get("/patterns/positive", response_model=PatternListResponse)
 async def get_positive_patterns():
     """Get list of positive sentiment patterns"""
     try:
-        patterns = load_patterns_from_file(POSITIVE_PATTERNS_FILE)
+        patterns, _, _ = await asyncio.to_thread(_get_patterns_cached, POSITIVE_PATTERNS_FILE)
         return {
             "patterns": patterns,
             "count": len(patterns)
@@ -393,7 +622,7 @@ async def get_positive_patterns():
 async def get_negative_patterns():
     """Get list of negative sentiment patterns"""
     try:
-        patterns = load_patterns_from_file(NEGATIVE_PATTERNS_FILE)
+        patterns, _, _ = await asyncio.to_thread(_get_patterns_cached, NEGATIVE_PATTERNS_FILE)
         return {
             "patterns": patterns,
             "count": len(patterns)
@@ -411,22 +640,13 @@ async def add_positive_pattern(request: PatternRequest):
     """
     try:
         pattern = request.pattern.strip().lower()
+        _validate_pattern(pattern)
 
-        # Load existing patterns
-        patterns = load_patterns_from_file(POSITIVE_PATTERNS_FILE)
-
-        # Check if pattern already exists
-        if pattern in patterns:
-            raise HTTPException(status_code=400, detail="Pattern already exists")
-
-        # Add new pattern to file
-        with open(POSITIVE_PATTERNS_FILE, 'a', encoding='utf-8') as f:
-            f.write(f"\n{pattern}")
+        patterns = await _add_pattern(POSITIVE_PATTERNS_FILE, pattern)
 
         logger.info(f"Added positive pattern: {pattern}")
 
         # Return updated list
-        patterns = load_patterns_from_file(POSITIVE_PATTERNS_FILE)
         return {
             "patterns": patterns,
             "count": len(patterns)
@@ -446,22 +666,13 @@ async def add_negative_pattern(request: PatternRequest):
     """
     try:
         pattern = request.pattern.strip().lower()
+        _validate_pattern(pattern)
 
-        # Load existing patterns
-        patterns = load_patterns_from_file(NEGATIVE_PATTERNS_FILE)
-
-        # Check if pattern already exists
-        if pattern in patterns:
-            raise HTTPException(status_code=400, detail="Pattern already exists")
-
-        # Add new pattern to file
-        with open(NEGATIVE_PATTERNS_FILE, 'a', encoding='utf-8') as f:
-            f.write(f"\n{pattern}")
+        patterns = await _add_pattern(NEGATIVE_PATTERNS_FILE, pattern)
 
         logger.info(f"Added negative pattern: {pattern}")
 
         # Return updated list
-        patterns = load_patterns_from_file(NEGATIVE_PATTERNS_FILE)
         return {
             "patterns": patterns,
             "count": len(patterns)
@@ -482,30 +693,14 @@ async def delete_positive_pattern(pattern: str):
     try:
         pattern_lower = pattern.strip().lower()
 
-        # Load existing patterns
-        patterns = load_patterns_from_file(POSITIVE_PATTERNS_FILE)
-
-        # Check if pattern exists
-        if pattern_lower not in patterns:
-            raise HTTPException(status_code=404, detail="Pattern not found")
-
-        # Remove the pattern
-        patterns.remove(pattern_lower)
-
-        # Rewrite file
-        with open(POSITIVE_PATTERNS_FILE, 'w', encoding='utf-8') as f:
-            f.write("# Positive sentiment patterns\n")
-            f.write("# One pattern per line\n")
-            f.write("# Lines starting with # are comments and will be ignored\n\n")
-            for p in patterns:
-                f.write(f"{p}\n")
+        remaining = await _delete_pattern(POSITIVE_PATTERNS_FILE, "Positive", pattern_lower)
 
         logger.info(f"Deleted positive pattern: {pattern_lower}")
 
         return {
             "message": "Pattern deleted successfully",
             "pattern": pattern_lower,
-            "remaining_count": len(patterns)
+            "remaining_count": remaining
         }
     except HTTPException:
         raise
@@ -523,30 +718,14 @@ async def delete_negative_pattern(pattern: str):
     try:
         pattern_lower = pattern.strip().lower()
 
-        # Load existing patterns
-        patterns = load_patterns_from_file(NEGATIVE_PATTERNS_FILE)
-
-        # Check if pattern exists
-        if pattern_lower not in patterns:
-            raise HTTPException(status_code=404, detail="Pattern not found")
-
-        # Remove the pattern
-        patterns.remove(pattern_lower)
-
-        # Rewrite file
-        with open(NEGATIVE_PATTERNS_FILE, 'w', encoding='utf-8') as f:
-            f.write("# Negative sentiment patterns\n")
-            f.write("# One pattern per line\n")
-            f.write("# Lines starting with # are comments and will be ignored\n\n")
-            for p in patterns:
-                f.write(f"{p}\n")
+        remaining = await _delete_pattern(NEGATIVE_PATTERNS_FILE, "Negative", pattern_lower)
 
         logger.info(f"Deleted negative pattern: {pattern_lower}")
 
         return {
             "message": "Pattern deleted successfully",
             "pattern": pattern_lower,
-            "remaining_count": len(patterns)
+            "remaining_count": remaining
         }
     except HTTPException:
         raise
@@ -562,24 +741,18 @@ async def replace_positive_patterns(request: PatternListRequest):
     - **patterns**: List of patterns to set
     """
     try:
-        # Validate and clean patterns
-        patterns = [p.strip().lower() for p in request.patterns if p.strip()]
+        # Clean patterns and remove duplicates while preserving order
+        unique_patterns = list(dict.fromkeys(
+            p for p in (p.strip().lower() for p in request.patterns) if p
+        ))
 
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_patterns = []
-        for p in patterns:
-            if p not in seen:
-                seen.add(p)
-                unique_patterns.append(p)
+        for p in unique_patterns:
+            _validate_pattern(p)
 
         # Write to file
-        with open(POSITIVE_PATTERNS_FILE, 'w', encoding='utf-8') as f:
-            f.write("# Positive sentiment patterns\n")
-            f.write("# One pattern per line\n")
-            f.write("# Lines starting with # are comments and will be ignored\n\n")
-            for p in unique_patterns:
-                f.write(f"{p}\n")
+        async with _pattern_lock(POSITIVE_PATTERNS_FILE):
+            await _write_patterns_file(POSITIVE_PATTERNS_FILE, "Positive", unique_patterns)
+            _invalidate_patterns_cached(POSITIVE_PATTERNS_FILE)
 
         logger.info(f"Replaced positive patterns with {len(unique_patterns)} new patterns")
 
@@ -587,6 +760,8 @@ async def replace_positive_patterns(request: PatternListRequest):
             "patterns": unique_patterns,
             "count": len(unique_patterns)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error replacing positive patterns: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -599,24 +774,18 @@ async def replace_negative_patterns(request: PatternListRequest):
     - **patterns**: List of patterns to set
     """
     try:
-        # Validate and clean patterns
-        patterns = [p.strip().lower() for p in request.patterns if p.strip()]
+        # Clean patterns and remove duplicates while preserving order
+        unique_patterns = list(dict.fromkeys(
+            p for p in (p.strip().lower() for p in request.patterns) if p
+        ))
 
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_patterns = []
-        for p in patterns:
-            if p not in seen:
-                seen.add(p)
-                unique_patterns.append(p)
+        for p in unique_patterns:
+            _validate_pattern(p)
 
         # Write to file
-        with open(NEGATIVE_PATTERNS_FILE, 'w', encoding='utf-8') as f:
-            f.write("# Negative sentiment patterns\n")
-            f.write("# One pattern per line\n")
-            f.write("# Lines starting with # are comments and will be ignored\n\n")
-            for p in unique_patterns:
-                f.write(f"{p}\n")
+        async with _pattern_lock(NEGATIVE_PATTERNS_FILE):
+            await _write_patterns_file(NEGATIVE_PATTERNS_FILE, "Negative", unique_patterns)
+            _invalidate_patterns_cached(NEGATIVE_PATTERNS_FILE)
 
         logger.info(f"Replaced negative patterns with {len(unique_patterns)} new patterns")
 
@@ -624,6 +793,8 @@ async def replace_negative_patterns(request: PatternListRequest):
             "patterns": unique_patterns,
             "count": len(unique_patterns)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error replacing negative patterns: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -632,12 +803,17 @@ if __name__ == "__main__":
     # Run the API server
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
+    # Each worker loads its own copy of the models, so scale this with available RAM
+    workers = int(os.environ.get("WORKERS", 1))
 
-    logger.info(f"Starting API server on {host}:{port}")
+    logger.info(f"Starting API server on {host}:{port} with {workers} worker(s)")
     uvicorn.run(
         "api:app",
         host=host,
         port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         reload=False,
         log_level="info"
     )
@@ -11,10 +11,16 @@ For usage instructions, see the accompanying README.md file or run with --help.
 
 import os
 import sys
+import shutil
 import subprocess
 import json
 import argparse
 import re
+import threading
+from datetime import datetime
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 from typing import Dict, List, Any, Union, Optional
 import logging
@@ -31,24 +37,47 @@ BASE_DIR = Path(__file__).parent.resolve()
 LLM_DIR = BASE_DIR / ".models" / "llm"
 LLM_MODEL_NAME = "llama-2-7b.Q4_K_M.gguf"
 LLM_URL = "https://huggingface.co/TheBloke/Llama-2-7B-GGUF/resolve/main/llama-2-7b.Q4_K_M.gguf"
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1MiB reads while downloading the LLM
 MAX_TOKENS_FAST_MODEL = 512
+PIPELINE_BATCH_SIZE = int(os.environ.get("PIPELINE_BATCH_SIZE", 32))  # Chunks per forward pass
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "torch")  # "torch" or "onnx"
+ONNX_DIR = BASE_DIR / ".models" / "onnx"
+CPU_INT8 = os.environ.get("SENTIMENT_CPU_INT8", "false").lower() in ("1", "true", "yes")  # Dynamic INT8 on CPU
+CPU_IPEX = os.environ.get("SENTIMENT_CPU_IPEX", "false").lower() in ("1", "true", "yes")  # IPEX + BF16 on CPU
 FAST_MODEL_NAME = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
 ROBERTA_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment-latest"
 MAX_LLM_CONTEXT = 512
+LLM_GPU_LAYERS = os.environ.get("LLM_GPU_LAYERS")  # Layers to offload; default: all on GPU hosts, none on CPU
 MAX_RESPONSE_TOKENS = 300
 NEGATIVE_PATTERNS_FILE = BASE_DIR / "negative_patterns.txt"
 POSITIVE_PATTERNS_FILE = BASE_DIR / "positive_patterns.txt"
 LLM_FALLBACK_LOG = BASE_DIR / "llm_fallback_segments.txt"
+PATTERN_TOMBSTONE_PREFIX = "!"  # Appended by the API when a pattern is deleted
+# Checked once: sys.stderr may be swapped for DevNull by another thread during LLM calls
+_STDERR_IS_TTY = sys.stderr.isatty()
+
+def _available_cpus() -> int:
+    """CPUs this process may run on (respects container CPU sets, unlike os.cpu_count)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+# CPU threads for torch and llama.cpp inference; OMP_NUM_THREADS must be set before torch is imported
+TORCH_THREADS = int(os.environ.get("TORCH_THREADS", _available_cpus()))
+os.environ.setdefault("OMP_NUM_THREADS", str(TORCH_THREADS))
 
 # ---------------------------
 # Imports - ML/AI dependencies
 # ---------------------------
 try:
     import torch
-    from transformers import pipeline, AutoTokenizer
-    from llama_cpp import Llama
+    from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+    from llama_cpp import Llama, LlamaGrammar
     from tqdm import tqdm
+    from tqdm.utils import CallbackIOWrapper
     import requests
+    import ahocorasick
 except ImportError as e:
     logger.error(f"Missing required dependency: {e}")
     logger.error("Please install dependencies using: pip install -r requirements.txt")
@@ -64,19 +93,23 @@ def download_llm_model() -> Path:
     
     if not model_path.exists():
         logger.info(f"Downloading {LLM_MODEL_NAME}...")
-        response = requests.get(LLM_URL, stream=True)
-        total = int(response.headers.get("content-length", 0))
-        
-        with open(model_path, "wb") as f, tqdm(
-            desc=f"Downloading {LLM_MODEL_NAME}",
-            total=total,
-            unit="iB",
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as bar:
-            for data in response.iter_content(chunk_size=1024):
-                size = f.write(data)
-                bar.update(size)
+        # Download to a .part file so an interrupted download is never mistaken for the model
+        part_path = model_path.with_name(model_path.name + ".part")
+        with requests.get(LLM_URL, stream=True) as response:
+            response.raise_for_status()
+            total = int(response.headers.get("content-length", 0))
+            response.raw.decode_content = True
+            
+            with open(part_path, "wb") as f, tqdm(
+                desc=f"Downloading {LLM_MODEL_NAME}",
+                total=total,
+                unit="iB",
+                unit_scale=True,
+                unit_divisor=1024,
+                disable=not _STDERR_IS_TTY,
+            ) as bar:
+                shutil.copyfileobj(CallbackIOWrapper(bar.update, response.raw, "read"), f, DOWNLOAD_CHUNK_SIZE)
+        os.replace(part_path, model_path)
                 
     return model_path
 
@@ -90,76 +123,202 @@ def load_patterns_from_file(file_path: Path) -> List[str]:
     Returns:
         List of patterns (lines that don't start with # and aren't empty)
     """
-    patterns = []
+    return load_pattern_file(file_path)[0]
+
+def load_pattern_file(file_path: Path) -> tuple[List[str], int]:
+    """
+    Load sentiment patterns from a text file, applying deletion tombstones.
+
+    Lines are applied in order: a plain line adds a pattern, a line starting with
+    PATTERN_TOMBSTONE_PREFIX removes it. This lets deletes append a line instead
+    of rewriting the file.
+
+    Args:
+        file_path: Path to the patterns file
+
+    Returns:
+        Tuple of (patterns in file order, number of tombstone lines)
+    """
+    patterns: Dict[str, None] = {}
+    tombstones = 0
     try:
         if file_path.exists():
             with open(file_path, 'r', encoding='utf-8') as f:
                 for line in f:
                     line = line.strip()
                     # Skip empty lines and comments
-                    if line and not line.startswith('#'):
-                        patterns.append(line.lower())
+                    if not line or line.startswith('#'):
+                        continue
+                    if line.startswith(PATTERN_TOMBSTONE_PREFIX):
+                        patterns.pop(line[len(PATTERN_TOMBSTONE_PREFIX):].strip().lower(), None)
+                        tombstones += 1
+                    else:
+                        patterns[line.lower()] = None
             logger.info(f"Loaded {len(patterns)} patterns from {file_path.name}")
         else:
             logger.warning(f"Pattern file not found: {file_path}")
     except Exception as e:
         logger.error(f"Error loading patterns from {file_path}: {e}")
 
+    return list(patterns), tombstones
+
+def pattern_file_version(file_path: Path) -> tuple:
+    """
+    Identify the current contents of a pattern file from a single stat.
+
+    The size is included because two writes within the filesystem's timestamp
+    resolution (or a file restored with its old mtime) can share an mtime.
+
+    Args:
+        file_path: Path to the patterns file
+
+    Returns:
+        Tuple of (mtime_ns, size), or (-1, -1) if the file is missing
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return (-1, -1)
+    return (st.st_mtime_ns, st.st_size)
+
+# Parsed pattern files keyed by path: (version, patterns). Keyed on the file version rather
+# than memoized forever so edits made through the API or the volume mount are picked up.
+_pattern_file_cache: Dict[str, tuple] = {}
+
+def load_patterns_cached(file_path: Path) -> tuple:
+    """
+    Load sentiment patterns from a text file, re-reading it only when it changes.
+
+    Args:
+        file_path: Path to the patterns file
+
+    Returns:
+        Tuple of patterns (same content as load_patterns_from_file)
+    """
+    version = pattern_file_version(file_path)
+
+    cached = _pattern_file_cache.get(str(file_path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    patterns = tuple(load_patterns_from_file(file_path))
+    _pattern_file_cache[str(file_path)] = (version, patterns)
     return patterns
 
-def detect_sentiment_keywords(text: str, context: str) -> tuple[Optional[str], Optional[str]]:
+@lru_cache(maxsize=256)
+def compile_context_pattern(context: str) -> "re.Pattern[str]":
+    """
+    Build the regex that finds the context word in segment text.
+
+    Works with alphanumeric brand names (e.g., "O2", "3G", "4G"): uses whitespace and
+    punctuation boundaries since word boundaries misbehave for terms starting or ending with digits.
+    """
+    escaped_context = re.escape(context.lower())
+    return re.compile(
+        r'(?:^|(?<=\s))' + escaped_context + r'(?=\s|[.,!?;:]|$)',
+        re.IGNORECASE
+    )
+
+# Aho-Corasick automaton over both pattern lists: (negative tuple, positive tuple, automaton)
+_pattern_matcher: Optional[tuple] = None
+_pattern_matcher_lock = threading.Lock()
+
+def get_pattern_matcher(negative_patterns: tuple, positive_patterns: tuple):
+    """
+    Return an Aho-Corasick automaton matching every negative and positive pattern.
+
+    Each word maps to (rank, index, sentiment, pattern) where negatives rank before
+    positives and index is the pattern's position in its file, so the smallest hit
+    is the same one the sequential "negatives first, in file order" scan would find.
+    The automaton is rebuilt only when the pattern tuples change.
+
+    Returns:
+        The automaton, or None if there are no patterns
+    """
+    global _pattern_matcher
+    cached = _pattern_matcher
+    if cached is not None and cached[0] is negative_patterns and cached[1] is positive_patterns:
+        return cached[2]
+
+    with _pattern_matcher_lock:
+        automaton = ahocorasick.Automaton()
+        for rank, sentiment, patterns in ((0, "negative", negative_patterns), (1, "positive", positive_patterns)):
+            for index, pattern in enumerate(patterns):
+                # A pattern listed in both files counts as negative, as in the sequential scan
+                if pattern not in automaton:
+                    automaton.add_word(pattern, (rank, index, sentiment, pattern))
+        if len(automaton) == 0:
+            automaton = None
+        else:
+            automaton.make_automaton()
+        _pattern_matcher = (negative_patterns, positive_patterns, automaton)
+    return automaton
+
+def detect_sentiment_keywords(
+    text: str,
+    context: str,
+    context_pattern: Optional["re.Pattern[str]"] = None,
+    negative_patterns: Optional[tuple] = None,
+    positive_patterns: Optional[tuple] = None
+) -> tuple[Optional[str], Optional[str]]:
     """
     Use rule-based detection for strong sentiment indicators.
 
     Args:
         text: The text to analyze
         context: The context word to focus on
+        context_pattern: Precompiled context regex (compiled from context if omitted)
+        negative_patterns: Preloaded negative patterns (loaded from file if omitted)
+        positive_patterns: Preloaded positive patterns (loaded from file if omitted)
 
     Returns:
         Tuple of (sentiment, matched_pattern) where sentiment is "positive", "negative", or None
         and matched_pattern is the pattern that was matched, or None
     """
     text_lower = text.lower()
-    context_lower = context.lower()
 
-    # Create flexible pattern that works with alphanumeric brand names (e.g., "O2", "3G", "4G")
-    escaped_context = re.escape(context_lower)
-    context_pattern = re.compile(
-        r'(?:^|(?<=\s))' + escaped_context + r'(?=\s|[.,!?;:]|$)',
-        re.IGNORECASE
-    )
+    if context_pattern is None:
+        context_pattern = compile_context_pattern(context)
     if context_pattern.search(text):
-        # Load patterns from files
-        negative_patterns = load_patterns_from_file(NEGATIVE_PATTERNS_FILE)
-        positive_patterns = load_patterns_from_file(POSITIVE_PATTERNS_FILE)
-
-        # Check for negative sentiment patterns
-        for pattern in negative_patterns:
-            if pattern in text_lower:
-                logger.info(f"Rule-based detection found negative pattern '{pattern}' in text")
-                return "negative", pattern
-
-        # Check for positive sentiment patterns
-        for pattern in positive_patterns:
-            if pattern in text_lower:
-                logger.info(f"Rule-based detection found positive pattern '{pattern}' in text")
-                return "positive", pattern
+        # Load patterns from files (cached until the files change)
+        if negative_patterns is None:
+            negative_patterns = load_patterns_cached(NEGATIVE_PATTERNS_FILE)
+        if positive_patterns is None:
+            positive_patterns = load_patterns_cached(POSITIVE_PATTERNS_FILE)
+
+        # Scan once for every pattern; negative patterns take priority over positive ones
+        matcher = get_pattern_matcher(negative_patterns, positive_patterns)
+        if matcher is not None:
+            best = min((hit for _, hit in matcher.iter(text_lower)), default=None)
+            if best is not None:
+                _, _, sentiment, pattern = best
+                logger.debug("Rule-based detection found %s pattern %r in text", sentiment, pattern)
+                return sentiment, pattern
 
     # No strong sentiment found
     return None, None
 
+# Segment keys every transcript segment must carry
+REQUIRED_SEGMENT_KEYS = ("id", "start", "end", "text")
+
+@lru_cache(maxsize=None)
+def _load_required_keys(schema_file: str) -> tuple:
+    """Read a schema file once and return its top-level required keys."""
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    return tuple(schema.get("required", []))
+
 def validate_json_against_schema(json_data: Dict[str, Any], schema_file: str) -> bool:
     """Validate a JSON object against a schema."""
     try:
-        logger.info(f"Validating JSON with keys: {list(json_data.keys())}")
-        logger.info(f"JSON data type: {type(json_data)}")
-
-        with open(schema_file, 'r', encoding='utf-8') as f:
-            schema = json.load(f)
+        # Per-request tracing only; keep off the INFO path so large payloads aren't dumped every call.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validating JSON with keys: %s", list(json_data.keys()))
 
-        # Basic validation (more comprehensive validation would use jsonschema library)
-        required_keys = schema.get("required", [])
-        logger.info(f"Schema requires keys: {required_keys}")
+        # Basic validation (more comprehensive validation would use jsonschema library).
+        # The schema is read once per path; it ships with the image and does not change.
+        required_keys = _load_required_keys(schema_file)
+        logger.debug("Schema requires keys: %s", required_keys)
 
         for key in required_keys:
             if key not in json_data:
@@ -169,16 +328,15 @@ def validate_json_against_schema(json_data: Dict[str, Any], schema_file: str) ->
 
         # Check segments structure for transcripts
         if "segments" in json_data:
-            logger.info(f"Validating {len(json_data['segments'])} segments")
+            logger.debug("Validating %d segments", len(json_data["segments"]))
             for i, segment in enumerate(json_data["segments"]):
-                required_segment_keys = ["id", "start", "end", "text"]
-                for seg_key in required_segment_keys:
+                for seg_key in REQUIRED_SEGMENT_KEYS:
                     if seg_key not in segment:
                         logger.error(f"Invalid segment {i}: missing required field '{seg_key}'")
                         logger.error(f"Segment has keys: {list(segment.keys())}")
                         return False
 
-        logger.info("Validation passed")
+        logger.debug("Validation passed")
         return True
     except Exception as e:
         logger.error(f"Schema validation error: {e}")
@@ -200,16 +358,15 @@ def load_file(file_path: str) -> Dict[str, Any]:
 # ---------------------------
 # Sentiment Analysis Functions
 # ---------------------------
-def analyze_overall_sentiment(file_path: str, model_name: str = "roberta") -> Dict[str, Any]:
+def analyze_overall_sentiment(file_path: str, model_name: str = "roberta", batch_size: int = PIPELINE_BATCH_SIZE) -> Dict[str, Any]:
     """
-    Analyze overall sentiment of text using the specified model.
+    Analyze overall sentiment of a text or JSON file using the specified model.
     
     Args:
         file_path: Path to the file to analyze
         model_name: Model to use - either 'distilbert' or 'roberta'
+        batch_size: Number of chunks per pipeline forward pass
     """
-    logger.info(f"Starting overall sentiment analysis using {model_name} model...")
-    
     # Load the file content
     data = load_file(file_path)
     text = data.get("text", "")
@@ -218,39 +375,208 @@ def analyze_overall_sentiment(file_path: str, model_name: str = "roberta") -> Di
         logger.error(f"No text content found in {file_path}")
         sys.exit(1)
     
-    # Select the model to use
-    if model_name == "distilbert":
-        model = FAST_MODEL_NAME
-        tokenizer_name = FAST_MODEL_NAME
-    else:  # default to roberta
-        model = ROBERTA_MODEL_NAME
-        tokenizer_name = ROBERTA_MODEL_NAME
-    
-    # Initialize tokenizer for chunking text
-    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
-    
-    def chunk_text(text, chunk_size=MAX_TOKENS_FAST_MODEL):
-        tokens = tokenizer.encode(text, truncation=False)
-        for i in range(0, len(tokens), chunk_size):
-            yield tokenizer.decode(tokens[i:i + chunk_size], clean_up_tokenization_spaces=True)
-    
-    # Set up sentiment analysis pipeline
-    device = 0 if torch.cuda.is_available() else -1
-    sentiment_pipe = pipeline(
-        "sentiment-analysis",
-        model=model,
-        device=device,
-        tokenizer=tokenizer_name
-    )
+    return analyze_overall_sentiment_text(text, model_name, batch_size)
+
+def analyze_overall_sentiment_text(text: str, model_name: str = "roberta", batch_size: int = PIPELINE_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Analyze overall sentiment of in-memory text using the specified model.
+    
+    Args:
+        text: The text content to analyze
+        model_name: Model to use - either 'distilbert' or 'roberta'
+        batch_size: Number of chunks per pipeline forward pass
+    
+    Raises:
+        ValueError: If text is empty
+    """
+    return analyze_overall_sentiment_batch([text], model_name, batch_size)[0]
+
+def _configure_torch_threads() -> None:
+    """Size torch's CPU thread pools to the CPUs actually available to the container."""
+    torch.set_num_threads(TORCH_THREADS)
+    try:
+        # Only allowed before any inter-op parallel work has started
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass
+
+def _load_onnx_model(model: str, key: str):
+    """
+    Load a classifier with ONNX Runtime, exporting it to .models/onnx on first use.
+    
+    Args:
+        model: Hugging Face model name
+        key: Short model key ('distilbert' or 'roberta'), used as the export directory name
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError:
+        logger.error("The ONNX backend requires optimum: pip install 'optimum[onnxruntime]'")
+        raise
+    
+    # ONNX Runtime applies all graph optimizations (fusion, constant folding) by default
+    provider = "CUDAExecutionProvider" if torch.cuda.is_available() else "CPUExecutionProvider"
+    export_dir = ONNX_DIR / key
+    if (export_dir / "model.onnx").exists():
+        return ORTModelForSequenceClassification.from_pretrained(export_dir, provider=provider)
+    
+    logger.info(f"Exporting {model} to ONNX at {export_dir}...")
+    ort_model = ORTModelForSequenceClassification.from_pretrained(model, export=True, provider=provider)
+    ort_model.save_pretrained(export_dir)
+    return ort_model
+
+# Loaded (tokenizer, pipeline, full model name) per model key, shared across requests
+_sentiment_pipelines: Dict[str, tuple] = {}
+_sentiment_pipelines_lock = threading.Lock()
+
+def load_sentiment_pipeline(model_name: str = "roberta") -> tuple:
+    """
+    Return the tokenizer and sentiment pipeline for a model, loading them once per process.
+    
+    Args:
+        model_name: Model to use - either 'distilbert' or 'roberta'
+    
+    Returns:
+        Tuple of (tokenizer, pipeline, full model name)
+    """
+    key = "distilbert" if model_name == "distilbert" else "roberta"
+    loaded = _sentiment_pipelines.get(key)
+    if loaded is not None:
+        return loaded
+    
+    with _sentiment_pipelines_lock:
+        loaded = _sentiment_pipelines.get(key)
+        if loaded is None:
+            # Select the model to use
+            model = FAST_MODEL_NAME if key == "distilbert" else ROBERTA_MODEL_NAME
+            logger.info(f"Loading {key} sentiment model ({model}) with {SENTIMENT_BACKEND} backend...")
+            
+            # Initialize tokenizer for chunking text
+            tokenizer = AutoTokenizer.from_pretrained(model)
+            
+            if not torch.cuda.is_available():
+                _configure_torch_threads()
+            
+            if SENTIMENT_BACKEND == "onnx":
+                sentiment_pipe = pipeline(
+                    "sentiment-analysis",
+                    model=_load_onnx_model(model, key),
+                    tokenizer=tokenizer
+                )
+            else:
+                # Set up sentiment analysis pipeline, in half precision on GPU
+                # (bfloat16 where supported, which avoids fp16 overflow)
+                if torch.cuda.is_available():
+                    device = 0
+                    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                else:
+                    device = -1
+                    dtype = torch.float32
+                
+                classifier = model
+                if device == -1 and CPU_INT8:
+                    # Quantize Linear layers to int8 weights; activations are quantized on the fly
+                    logger.info(f"Applying dynamic INT8 quantization to {key} for CPU inference")
+                    classifier = torch.quantization.quantize_dynamic(
+                        AutoModelForSequenceClassification.from_pretrained(model),
+                        {torch.nn.Linear},
+                        dtype=torch.qint8
+                    )
+                    dtype = None
+                elif device == -1 and CPU_IPEX:
+                    # Fused kernels and BF16 (AMX on Sapphire Rapids) via Intel Extension for PyTorch
+                    try:
+                        import intel_extension_for_pytorch as ipex
+                    except ImportError:
+                        logger.error("SENTIMENT_CPU_IPEX requires intel-extension-for-pytorch")
+                        raise
+                    logger.info(f"Optimizing {key} with IPEX (bfloat16) for CPU inference")
+                    classifier = ipex.optimize(
+                        AutoModelForSequenceClassification.from_pretrained(model).eval(),
+                        dtype=torch.bfloat16
+                    )
+                    dtype = None
+                
+                sentiment_pipe = pipeline(
+                    "sentiment-analysis",
+                    model=classifier,
+                    device=device,
+                    tokenizer=tokenizer,
+                    torch_dtype=dtype
+                )
+            loaded = (tokenizer, sentiment_pipe, model)
+            _sentiment_pipelines[key] = loaded
+    return loaded
+
+def analyze_overall_sentiment_batch(texts: List[str], model_name: str = "roberta", batch_size: int = PIPELINE_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    Analyze overall sentiment of several texts with one tokenizer and pipeline.
+    
+    Args:
+        texts: The text contents to analyze
+        model_name: Model to use - either 'distilbert' or 'roberta'
+        batch_size: Number of chunks per pipeline forward pass
+    
+    Returns:
+        One result dict per text, in the same order as texts
+    
+    Raises:
+        ValueError: If any text is empty
+    """
+    logger.info(f"Starting overall sentiment analysis of {len(texts)} text(s) using {model_name} model...")
+    
+    if not all(texts):
+        raise ValueError("No text content to analyze")
+    
+    tokenizer, sentiment_pipe, model = load_sentiment_pipeline(model_name)
+    classifier = sentiment_pipe.model
+    id2label = classifier.config.id2label
+    use_cpu_bf16 = CPU_IPEX and not CPU_INT8 and SENTIMENT_BACKEND != "onnx" and sentiment_pipe.device.type == "cpu"
+    
+    # Each chunk gets its own special tokens, so leave room for them
+    chunk_size = MAX_TOKENS_FAST_MODEL - tokenizer.num_special_tokens_to_add()
     
-    # Process text in chunks
-    chunks = list(chunk_text(text))
-    results = []
+    def chunk_ids(text):
+        # Tokenize once and keep the ids; chunks are fed to the model without decode/re-encode
+        tokens = tokenizer.encode(text, add_special_tokens=False)
+        for i in range(0, max(len(tokens), 1), chunk_size):
+            yield tokenizer.build_inputs_with_special_tokens(tokens[i:i + chunk_size])
     
-    for chunk in tqdm(chunks, desc="Analyzing sentiment", ncols=80):
-        res = sentiment_pipe(chunk, truncation=True, max_length=MAX_TOKENS_FAST_MODEL)
-        results.extend(res)
+    # Chunk every text, remembering which chunks belong to which text
+    chunks = []
+    spans = []
+    for text in texts:
+        start = len(chunks)
+        chunks.extend(chunk_ids(text))
+        spans.append((start, len(chunks)))
     
+    # Feed chunks shortest-first so each batch pads to a similar length,
+    # then put the results back in chunk order
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+    
+    # Process all chunks in padded batches rather than one forward pass per chunk
+    logger.info(f"Analyzing {len(chunks)} chunk(s) in batches of {batch_size}")
+    results = [None] * len(chunks)
+    for b in range(0, len(order), batch_size):
+        batch_order = order[b:b + batch_size]
+        inputs = tokenizer.pad(
+            {"input_ids": [chunks[i] for i in batch_order]},
+            return_tensors="pt"
+        ).to(sentiment_pipe.device)
+        # No autograd bookkeeping; BF16 autocast when the model was IPEX-optimized for CPU
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=use_cpu_bf16):
+            probs = classifier(**inputs).logits.float().softmax(-1)
+        scores, label_ids = probs.max(-1)
+        for i, label_id, score in zip(batch_order, label_ids.tolist(), scores.tolist()):
+            results[i] = {"label": id2label[label_id], "score": score}
+    
+    return [
+        _summarize_overall_results(results[start:end], model_name, model)
+        for start, end in spans
+    ]
+
+def _summarize_overall_results(results: List[Dict[str, Any]], model_name: str, model: str) -> Dict[str, Any]:
+    """Turn per-chunk pipeline labels into the overall sentiment output structure."""
     # Count sentiment results based on model output format
     if model_name == "distilbert":
         pos = sum(1 for r in results if r['label'].lower().startswith("pos"))
@@ -278,7 +604,7 @@ def analyze_overall_sentiment(file_path: str, model_name: str = "roberta") -> Di
         "metadata": {
             "model_used": model_name,
             "model_full_name": model,
-            "total_chunks_analyzed": len(chunks),
+            "total_chunks_analyzed": len(results),
             "device": "GPU (CUDA)" if torch.cuda.is_available() else "CPU"
         }
     }
@@ -287,9 +613,7 @@ def analyze_overall_sentiment(file_path: str, model_name: str = "roberta") -> Di
     return output
 
 def analyze_contextual_sentiment(file_path: str, context: str) -> Dict[str, Any]:
-    """Analyze contextual sentiment using Llama 2 model combined with rule-based detection."""
-    logger.info(f"Starting contextual sentiment analysis for context: {context}...")
-    
+    """Analyze contextual sentiment of a transcript JSON file."""
     # Validate the input file against the transcript schema
     schema_path = os.path.join(BASE_DIR, "transcript-schema.json")
     data = load_file(file_path)
@@ -298,32 +622,152 @@ def analyze_contextual_sentiment(file_path: str, context: str) -> Dict[str, Any]
         logger.error(f"Invalid transcript format in {file_path}")
         sys.exit(1)
     
+    if not data.get("segments"):
+        logger.error("No segments found in the transcript")
+        sys.exit(1)
+    
+    return analyze_contextual_sentiment_dict(data, context)
+
+# GBNF grammar that only lets the LLM emit {"sentiment": "<label>"}
+LLM_SENTIMENT_GRAMMAR = r'root ::= "{\"sentiment\": \"" ("positive" | "negative" | "neutral") "\"}"'
+
+# LLM response extraction: the {"sentiment": "..."} field first, then any bare sentiment word
+LLM_SENTIMENT_FIELD_RE = re.compile(r'"sentiment"\s*:\s*"(positive|negative|neutral)"', re.IGNORECASE)
+LLM_SENTIMENT_WORD_RE = re.compile(r'\b(positive|negative|neutral)\b', re.IGNORECASE)
+
+def parse_llm_sentiment(response_text: str) -> Optional[str]:
+    """
+    Extract the sentiment label from an LLM response.
+
+    Returns:
+        "positive", "negative" or "neutral", or None if no label was found
+    """
+    match = LLM_SENTIMENT_FIELD_RE.search(response_text)
+    if match:
+        logger.debug("Extracted sentiment from JSON field: %s", match.group(0))
+    else:
+        match = LLM_SENTIMENT_WORD_RE.search(response_text)
+        if match:
+            logger.debug("Extracted sentiment word: %s", match.group(1))
+    return match.group(1).lower() if match else None
+
+def build_llm_prompt(context: str, segment_text: str) -> str:
+    """
+    Build the LLM prompt for one segment.
+
+    The instructions depend only on the context, so they come first and the segment
+    text last: llama.cpp keeps the KV cache for the longest prefix shared with the
+    previous prompt, so consecutive segments only evaluate their own text.
+    """
+    return f"""Analyze sentiment about "{context}" in a text.
+
+Rules:
+- Only sentiment about "{context}" matters
+- Handle negation (e.g., "not good" = negative)
+- Questions = neutral
+- Mixed sentiment = use the stronger one
+
+Respond ONLY with valid JSON in this exact format:
+{{"sentiment": "positive"}} OR {{"sentiment": "negative"}} OR {{"sentiment": "neutral"}}
+
+Text: "{segment_text}"
+
+JSON response:"""
+
+class DevNull:
+    """Output sink used to silence llama_cpp's prints."""
+    def write(self, msg): pass
+    def flush(self): pass
+    def isatty(self): return False
+
+# Loaded (Llama, grammar) shared across requests, None until the first LLM fallback
+_llm: Optional[tuple] = None
+_llm_lock = threading.Lock()
+_llm_call_lock = threading.Lock()
+
+def load_llm() -> tuple:
+    """
+    Return the Llama model and sentiment grammar, loading them once per process.
+    
+    Returns:
+        Tuple of (Llama model, LlamaGrammar constraining the JSON answer)
+    """
+    global _llm
+    if _llm is not None:
+        return _llm
+    
+    with _llm_lock:
+        if _llm is None:
+            # Suppress llama_cpp logs and prints
+            logging.getLogger("llama_cpp").setLevel(logging.CRITICAL)
+            
+            # Download and load the LLM model
+            logger.info("Loading Llama model for contextual analysis...")
+            model_path = download_llm_model()
+            
+            # Offload every layer to the GPU when one is available
+            if LLM_GPU_LAYERS is not None:
+                n_gpu_layers = int(LLM_GPU_LAYERS)
+            else:
+                n_gpu_layers = -1 if torch.cuda.is_available() else 0
+            
+            try:
+                _stdout, _stderr = sys.stdout, sys.stderr
+                sys.stdout = sys.stderr = DevNull()
+                llm = Llama(
+                    model_path=str(model_path),
+                    n_ctx=1024,
+                    n_batch=512,
+                    n_gpu_layers=n_gpu_layers,
+                    flash_attn=n_gpu_layers != 0,
+                    n_threads=TORCH_THREADS
+                )
+            finally:
+                sys.stdout, sys.stderr = _stdout, _stderr
+            
+            _llm = (llm, LlamaGrammar.from_string(LLM_SENTIMENT_GRAMMAR, verbose=False))
+    return _llm
+
+def analyze_contextual_sentiment_dict(data: Dict[str, Any], context: str) -> Dict[str, Any]:
+    """
+    Analyze contextual sentiment of an in-memory transcript using Llama 2 model
+    combined with rule-based detection.
+    
+    Args:
+        data: Transcript dict already validated against transcript-schema.json
+        context: The context word to analyze sentiment for
+    
+    Raises:
+        ValueError: If the transcript has no segments
+    """
+    logger.info(f"Starting contextual sentiment analysis for context: {context}...")
+    
     # Extract segments from the transcript
     segments = data.get("segments", [])
     if not segments:
-        logger.error("No segments found in the transcript")
-        sys.exit(1)
+        raise ValueError("No segments found in the transcript")
     
     # Find segments containing the context word
     context_segments = []
-    # Create flexible pattern that works with alphanumeric brand names (e.g., "O2", "3G", "4G")
-    # Use word boundaries but handle cases where boundaries don't work (alphanumeric)
-    escaped_context = re.escape(context.lower())
-    # Try word boundary match, but also allow standalone match for alphanumeric terms
-    context_pattern = re.compile(
-        r'(?:^|(?<=\s))' + escaped_context + r'(?=\s|[.,!?;:]|$)',
-        re.IGNORECASE
-    )
+    context_pattern = compile_context_pattern(context)
 
-    for segment in segments:
-        segment_text = segment.get("text", "")
+    # Search all segments in one pass over their newline-joined text. The newline is
+    # whitespace, so the pattern's boundaries behave exactly as at a segment's start/end.
+    texts = [segment.get("text", "") for segment in segments]
+    starts = list(accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+    matched = sorted({
+        bisect_right(starts, match.start()) - 1
+        for match in context_pattern.finditer("\n".join(texts))
+    })
+
+    for i in matched:
+        segment_text = texts[i]
         # Skip segments with only one word (single-word segments are too short for sentiment analysis)
         word_count = len(segment_text.split())
         if word_count <= 1:
-            logger.debug(f"Skipping single-word segment {segment.get('id')}: '{segment_text}'")
+            logger.debug(f"Skipping single-word segment {segments[i].get('id')}: '{segment_text}'")
             continue
-        if context_pattern.search(segment_text):
-            context_segments.append(segment)
+        context_segments.append(segments[i])
     
     if not context_segments:
         logger.warning(f"Context '{context}' not found in any segment")
@@ -336,38 +780,35 @@ def analyze_contextual_sentiment(file_path: str, context: str) -> Dict[str, Any]
             "segments": []
         }
     
-    # Download and load the LLM model
-    logger.info("Loading Llama model for contextual analysis...")
-    model_path = download_llm_model()
-    
-    # Suppress llama_cpp logs and prints
-    logging.getLogger("llama_cpp").setLevel(logging.CRITICAL)
-    
-    class DevNull:
-        def write(self, msg): pass
-        def flush(self): pass
-    
-    # Load the LLM model
+    # The LLM is only loaded once a segment needs it, so transcripts fully
+    # decided by the pattern rules never pay for the ~4GB model load
     llm = None
-    try:
-        _stdout, _stderr = sys.stdout, sys.stderr
-        sys.stdout = sys.stderr = DevNull()
-        llm = Llama(model_path=str(model_path), n_ctx=1024)
-    finally:
-        sys.stdout, sys.stderr = _stdout, _stderr
+    grammar = None
     
     # Process each segment containing the context
     pos = neg = neutral = 0
     result_segments = []
+
+    # Load the pattern files once for the whole transcript
+    negative_patterns = load_patterns_cached(NEGATIVE_PATTERNS_FILE)
+    positive_patterns = load_patterns_cached(POSITIVE_PATTERNS_FILE)
+
+    # LLM results by normalized segment text, so repeated phrases are only sent once
+    llm_results: Dict[str, tuple] = {}
+    fallback_entries: List[str] = []
     
-    for segment in tqdm(context_segments, desc="Analyzing segments", ncols=80):
+    # Progress bars only make sense on a terminal (not in the API container logs)
+    for segment in tqdm(context_segments, desc="Analyzing segments", ncols=80, disable=not _STDERR_IS_TTY):
         segment_text = segment.get("text", "")
 
         # First check for strong sentiment indicators with rule-based approach
-        rule_sentiment, matched_pattern = detect_sentiment_keywords(segment_text, context)
+        rule_sentiment, matched_pattern = detect_sentiment_keywords(
+            segment_text, context, context_pattern, negative_patterns, positive_patterns
+        )
 
         detection_method = None
         detection_details = None
+        llm_key = " ".join(segment_text.lower().split())
 
         if rule_sentiment:
             # Strong rule-based sentiment found, use it
@@ -375,117 +816,62 @@ def analyze_contextual_sentiment(file_path: str, context: str) -> Dict[str, Any]
             detection_method = "rule-based"
             detection_details = f"Matched pattern: '{matched_pattern}'"
 
-            # Enhanced logging for rule-based detection
-            logger.info("="*80)
-            logger.info(f"SEGMENT {segment.get('id')} RULE-BASED DETECTION")
-            logger.info(f"Context: {context}")
-            logger.info(f"Segment Text: {segment_text}")
-            logger.info(f"✓ Matched Pattern: '{matched_pattern}'")
-            logger.info(f"✓ Detected Sentiment: {sentiment}")
-            logger.info("="*80)
+            logger.debug("segment=%s rule-based pattern=%r sentiment=%s", segment.get('id'), matched_pattern, sentiment)
+        elif llm_key in llm_results:
+            # Same text already went through the LLM in this transcript, reuse its answer
+            sentiment, detection_method, detection_details = llm_results[llm_key]
+            logger.debug("segment=%s reused LLM result sentiment=%s", segment.get('id'), sentiment)
         else:
             # No pattern match - log this segment for future pattern updates
-            logger.info("="*80)
-            logger.info(f"SEGMENT {segment.get('id')} - NO PATTERN MATCH (Falling back to LLM)")
-            logger.info(f"Context: {context}")
-            logger.info(f"Segment Text: {segment_text}")
-            logger.info("="*80)
+            logger.debug("segment=%s no pattern match, falling back to LLM: %s", segment.get('id'), segment_text)
 
-            # Save segment to LLM fallback log file
-            try:
-                from datetime import datetime
-                with open(LLM_FALLBACK_LOG, 'a', encoding='utf-8') as fallback_file:
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    fallback_file.write(f"\n{'='*80}\n")
-                    fallback_file.write(f"Timestamp: {timestamp}\n")
-                    fallback_file.write(f"Context: {context}\n")
-                    fallback_file.write(f"Segment ID: {segment.get('id')}\n")
-                    fallback_file.write(f"Segment Text: {segment_text}\n")
-                    fallback_file.write(f"{'='*80}\n")
-                logger.info(f"Saved segment to LLM fallback log: {LLM_FALLBACK_LOG}")
-            except Exception as e:
-                logger.warning(f"Failed to save segment to fallback log: {e}")
+            # Queue segment for the LLM fallback log file (written once after the loop)
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            fallback_entries.append(
+                f"\n{'='*80}\n"
+                f"Timestamp: {timestamp}\n"
+                f"Context: {context}\n"
+                f"Segment ID: {segment.get('id')}\n"
+                f"Segment Text: {segment_text}\n"
+                f"{'='*80}\n"
+            )
             # No strong indicators, use simplified LLM prompt with better parameters
-            prompt = f"""Analyze sentiment about "{context}" in this text: "{segment_text}"
-
-Rules:
-- Only sentiment about "{context}" matters
-- Handle negation (e.g., "not good" = negative)
-- Questions = neutral
-- Mixed sentiment = use the stronger one
+            prompt = build_llm_prompt(context, segment_text)
+            if llm is None:
+                llm, grammar = load_llm()
 
-Respond ONLY with valid JSON in this exact format:
-{{"sentiment": "positive"}} OR {{"sentiment": "negative"}} OR {{"sentiment": "neutral"}}
-
-JSON response:"""
-
-            try:
-                _stdout, _stderr = sys.stdout, sys.stderr
-                sys.stdout = sys.stderr = DevNull()
-                # Use more controlled generation parameters for better JSON output
-                response = llm(
-                    prompt,
-                    max_tokens=120,  # Allow enough space for response
-                    temperature=0.1,  # Low temperature for more deterministic output
-                    top_p=0.9,
-                    stop=["\n\n", "Explanation:", "Note:"],  # Stop at common explanation markers
-                    repeat_penalty=1.1
-                )
-            finally:
-                sys.stdout, sys.stderr = _stdout, _stderr
+            # A Llama instance is not safe to call from several threads at once
+            with _llm_call_lock:
+                try:
+                    _stdout, _stderr = sys.stdout, sys.stderr
+                    sys.stdout = sys.stderr = DevNull()
+                    # The grammar constrains output to the JSON answer, so only a few tokens are needed
+                    response = llm(
+                        prompt,
+                        grammar=grammar,
+                        max_tokens=16,
+                        temperature=0.0
+                    )
+                finally:
+                    sys.stdout, sys.stderr = _stdout, _stderr
 
             # Parse JSON response with improved extraction
             try:
                 llm_response_text = response['choices'][0]['text'].strip()
 
-                # Enhanced logging - clearly show segment analysis
-                logger.info("="*80)
-                logger.info(f"SEGMENT {segment.get('id')} LLM ANALYSIS")
-                logger.info(f"Context: {context}")
-                logger.info(f"Segment Text: {segment_text}")
-                logger.info(f"Raw LLM Response: {llm_response_text}")
-                logger.info(f"Response Length: {len(llm_response_text)} characters")
-                logger.info("="*80)
-
-                # Multiple extraction strategies for robustness
-                sentiment = None
-
-                # Strategy 1: Try to find ANY JSON object with sentiment key
-                json_matches = re.finditer(r'\{[^}]*\}', llm_response_text)
-                for match in json_matches:
-                    try:
-                        potential_json = match.group(0)
-                        parsed = json.loads(potential_json)
-                        if "sentiment" in parsed:
-                            sentiment = parsed["sentiment"].lower()
-                            logger.info(f"✓ Extracted JSON: {potential_json}")
-                            break
-                    except json.JSONDecodeError:
-                        continue
-
-                # Strategy 2: Look for sentiment value directly in quotes
-                if not sentiment:
-                    value_match = re.search(r'"sentiment"\s*:\s*"(positive|negative|neutral)"', llm_response_text, re.IGNORECASE)
-                    if value_match:
-                        sentiment = value_match.group(1).lower()
-                        logger.info(f"✓ Extracted sentiment from pattern: {sentiment}")
+                logger.debug("segment=%s raw LLM response: %s", segment.get('id'), llm_response_text)
 
-                # Strategy 3: Look for just the sentiment words
-                if not sentiment:
-                    word_match = re.search(r'\b(positive|negative|neutral)\b', llm_response_text, re.IGNORECASE)
-                    if word_match:
-                        sentiment = word_match.group(1).lower()
-                        logger.info(f"✓ Extracted sentiment word: {sentiment}")
+                sentiment = parse_llm_sentiment(llm_response_text)
 
                 # Validate and set sentiment
                 if sentiment and sentiment in ["positive", "negative", "neutral"]:
                     detection_method = "llm-based"
                     detection_details = f"Model: Llama 2 7B"
-                    logger.info(f"✓ Successfully parsed sentiment: {sentiment}")
+                    logger.debug("segment=%s LLM sentiment=%s", segment.get('id'), sentiment)
                 else:
                     raise ValueError(f"Invalid or missing sentiment value: {sentiment}")
 
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
+            except (ValueError, KeyError) as e:
                 logger.error("="*80)
                 logger.error(f"✗ PARSING FAILED - Segment {segment.get('id')}")
                 logger.error(f"Error: {type(e).__name__}: {e}")
@@ -506,6 +892,8 @@ JSON response:"""
                 detection_method = "llm-based"
                 detection_details = f"Failed to parse LLM response (error: {str(e)}), defaulted to neutral"
 
+            llm_results[llm_key] = (sentiment, detection_method, detection_details)
+
         # Update counters
         if sentiment == "positive":
             pos += 1
@@ -525,6 +913,15 @@ JSON response:"""
             "detection_details": detection_details
         })
     
+    # Save LLM fallback segments to the log file in one write
+    if fallback_entries:
+        try:
+            with open(LLM_FALLBACK_LOG, 'a', encoding='utf-8') as fallback_file:
+                fallback_file.write("".join(fallback_entries))
+            logger.info(f"Saved {len(fallback_entries)} segment(s) to LLM fallback log: {LLM_FALLBACK_LOG}")
+        except Exception as e:
+            logger.warning(f"Failed to save segments to fallback log: {e}")
+    
     # Determine overall sentiment
     if pos > neg and pos > neutral:
         overall = "positive"
@@ -560,6 +957,8 @@ JSON response:"""
 # ---------------------------
 def main():
     """Main entry point for the CLI."""
+    global SENTIMENT_BACKEND
+    
     parser = argparse.ArgumentParser(
         description="Advanced Sentiment Analysis Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -595,6 +994,20 @@ Examples:
         help="Context word for contextual analysis (required for contextual analysis)"
     )
     
+    parser.add_argument(
+        "--batch-size", "-b",
+        type=int,
+        default=PIPELINE_BATCH_SIZE,
+        help=f"Chunks per model forward pass for overall analysis (default: {PIPELINE_BATCH_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=["torch", "onnx"],
+        default=SENTIMENT_BACKEND,
+        help=f"Inference backend for overall analysis (default: {SENTIMENT_BACKEND})"
+    )
+    
     parser.add_argument(
         "--output", "-o", 
         type=str, 
@@ -602,6 +1015,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    SENTIMENT_BACKEND = args.backend
     
     # Interactive mode if required arguments are missing
     analysis_type = args.type or input("Enter analysis type (overall/contextual): ").strip().lower()
@@ -623,7 +1037,7 @@ Examples:
             logger.error("Invalid model name. Must be 'distilbert' or 'roberta'.")
             sys.exit(1)
         
-        result = analyze_overall_sentiment(file_path, model_name)
+        result = analyze_overall_sentiment(file_path, model_name, args.batch_size)
     else:  # contextual
         context = args.context or input("Enter context word for analysis: ").strip()
         if not context:
@@ -9,6 +9,26 @@ class Settings(BaseSettings):
     MINIO_BUCKET: str = "audio-transcripts"
     MINIO_SECURE: bool = False
 
+    # Uploads larger than one part go to MinIO as a parallel multipart upload
+    UPLOAD_PART_SIZE: int = 16 * 1024 * 1024
+    UPLOAD_PARALLEL_PARTS: int = 4
+
+    # JSON larger than this is stored zstd-compressed (Content-Encoding: zstd)
+    COMPRESS_MIN_BYTES: int = 2048
+    ZSTD_LEVEL: int = 3
+
+    # Seconds to cache positive existence checks (per worker, so a delete made on
+    # another worker can go unnoticed this long), and the longest a presigned URL
+    # is reused (never more than a tenth of its lifetime)
+    EXISTS_CACHE_TTL: int = 5
+    PRESIGNED_URL_CACHE_TTL: int = 300
+
+    # Seconds between bucket checks while the bucket is not yet verified
+    BUCKET_RECHECK_SECONDS: int = 30
+
+    # Threads used to run blocking MinIO calls off the event loop
+    IO_THREADS: int = 32
+
     class Config:
         env_file = ".env"
         case_sensitive = True
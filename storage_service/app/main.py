@@ -1,39 +1,81 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from typing import Optional
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from itertools import islice
+import orjson
 
 from . import schemas
-from .storage import storage_manager
+from .storage import StorageManager
 from .config import settings
 
-# Configure structured logging
+# Configure structured logging. Handlers only enqueue records; a listener thread
+# (started in the lifespan) writes them out, so request handlers never block on stderr.
+_log_queue = queue.Queue(-1)
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_stream, respect_handler_level=True)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _log_listener.start()
+    # minio-py is blocking, so every storage call runs in this pool instead of
+    # on the event loop; size it for the number of concurrent S3 requests
+    executor = ThreadPoolExecutor(max_workers=settings.IO_THREADS, thread_name_prefix="storage-io")
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Each worker process builds its own manager (and connection pool) at startup
+    # rather than on import; the bucket check blocks, so it runs in the pool too
+    app.state.storage = await asyncio.to_thread(StorageManager)
+    yield
+    app.state.storage.close()
+    executor.shutdown(wait=False)
+    # Flushes any queued records before the worker exits
+    _log_listener.stop()
+
+
+def get_storage(request: Request) -> StorageManager:
+    """Return the storage manager created for this app in the lifespan handler."""
+    return request.app.state.storage
+
+
+# Object names serialized per chunk of the streamed /list response
+LIST_PAGE_SIZE = 1000
+
 app = FastAPI(
     title="Storage Service API",
     description="Microservice for managing JSON transcript storage in MinIO",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 @app.get("/")
-async def root():
+async def root(storage: StorageManager = Depends(get_storage)):
     """Health check endpoint."""
     return {
         "status": "healthy",
         "service": "Storage Service",
-        "bucket": storage_manager.client.bucket_exists(storage_manager.client._base_url.netloc)
+        "bucket": settings.MINIO_BUCKET,
+        "ready": await asyncio.to_thread(storage.bucket_ready)
     }
 
 
-@app.post("/upload", response_model=schemas.UploadResponse)
-async def upload_json(request: schemas.UploadRequest):
+@app.post("/upload", responses={200: {"model": schemas.UploadResponse}})
+async def upload_json(request: schemas.UploadRequest, storage: StorageManager = Depends(get_storage)):
     """
     Upload JSON data to storage.
 
@@ -41,141 +83,291 @@ async def upload_json(request: schemas.UploadRequest):
     - **data**: JSON object to store
     """
     try:
-        full_path = storage_manager.upload_json(request.object_path, request.data)
-        return schemas.UploadResponse(
-            success=True,
-            object_path=request.object_path,
-            full_path=full_path,
-            message="JSON uploaded successfully"
-        )
+        full_path = await asyncio.to_thread(storage.upload_json, request.object_path, request.data)
+        return {
+            "success": True,
+            "object_path": request.object_path,
+            "full_path": full_path,
+            "message": "JSON uploaded successfully"
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
-@app.get("/download/{object_path:path}", response_model=schemas.DownloadResponse)
-async def download_json(object_path: str):
+@app.get("/download/{object_path:path}", responses={200: {"model": schemas.DownloadResponse}})
+async def download_json(object_path: str, storage: StorageManager = Depends(get_storage)):
     """
     Download JSON data from storage.
 
     - **object_path**: Path in storage to download
     """
     try:
-        data = storage_manager.download_json(object_path)
+        data = await asyncio.to_thread(storage.download_json, object_path)
         if data is None:
-            return schemas.DownloadResponse(
-                success=False,
-                object_path=object_path,
-                data=None,
-                message="Object not found"
-            )
-
-        return schemas.DownloadResponse(
-            success=True,
-            object_path=object_path,
-            data=data,
-            message="JSON downloaded successfully"
-        )
+            return {
+                "success": False,
+                "object_path": object_path,
+                "data": None,
+                "message": "Object not found"
+            }
+
+        # Returned as a response directly so the transcript isn't walked by
+        # jsonable_encoder before orjson serializes it
+        return ORJSONResponse({
+            "success": True,
+            "object_path": object_path,
+            "data": data,
+            "message": "JSON downloaded successfully"
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
+
+
+@app.get("/download-raw/{object_path:path}")
+async def download_raw(object_path: str, request: Request, storage: StorageManager = Depends(get_storage)):
+    """
+    Stream an object's stored bytes as-is, without parsing and re-serializing the JSON.
+
+    Compressed objects are passed through with `Content-Encoding: zstd` when the
+    client's `Accept-Encoding` allows it, and decompressed here otherwise.
+
+    - **object_path**: Path in storage to download
+    """
+    try:
+        response = await asyncio.to_thread(storage.open_object, object_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
+    if response is None:
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    try:
+        accepted = {
+            encoding.split(";")[0].strip().lower()
+            for encoding in request.headers.get("accept-encoding", "").split(",")
+        }
+        headers = {"Vary": "Accept-Encoding"}
+        passthrough = "zstd" in accepted and storage.is_zstd(response)
+        if passthrough:
+            headers["Content-Encoding"] = "zstd"
 
-@app.get("/presigned-url/{object_path:path}", response_model=schemas.PresignedUrlResponse)
+        # The background task releases the connection even if the client
+        # disconnects before the body generator ever runs
+        return StreamingResponse(
+            storage.iter_object(response, decompress=not passthrough),
+            media_type="application/json",
+            headers=headers,
+            background=BackgroundTask(storage.release_object, response)
+        )
+    except BaseException:
+        storage.release_object(response)
+        raise
+
+
+@app.get("/presigned-url/{object_path:path}", responses={200: {"model": schemas.PresignedUrlResponse}})
 async def get_presigned_url(
     object_path: str,
-    expires: int = Query(3600, description="URL expiration in seconds", ge=60, le=604800)
+    response: Response,
+    expires: int = Query(3600, description="URL expiration in seconds", ge=60, le=604800),
+    check_exists: bool = Query(False, description="Return 404 if the object does not exist"),
+    storage: StorageManager = Depends(get_storage)
 ):
     """
     Generate a presigned URL for direct download access.
 
+    Signing doesn't need the object to exist; without `check_exists` a missing
+    object only shows up as a 404 when the URL is fetched.
+
     - **object_path**: Path in storage
     - **expires**: URL expiration time in seconds (60 to 604800, default 3600)
+    - **check_exists**: Verify the object exists first (default false)
     """
     try:
-        if not storage_manager.object_exists(object_path):
+        if check_exists and not await asyncio.to_thread(storage.object_exists, object_path):
             raise HTTPException(status_code=404, detail="Object not found")
 
-        url = storage_manager.get_presigned_url(object_path, expires)
-        return schemas.PresignedUrlResponse(
-            success=True,
-            object_path=object_path,
-            url=url,
-            expires_in_seconds=expires
-        )
+        url = await asyncio.to_thread(storage.get_presigned_url, object_path, expires)
+        # The URL may come from the cache, but stays valid at least this long
+        max_age = expires - storage.presigned_url_cache_ttl(expires)
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
+        return {
+            "success": True,
+            "object_path": object_path,
+            "url": url,
+            "expires_in_seconds": expires
+        }
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate URL: {str(e)}")
 
 
-@app.delete("/delete/{object_path:path}", response_model=schemas.DeleteResponse)
-async def delete_object(object_path: str):
+@app.get("/presigned-upload-url/{object_path:path}", responses={200: {"model": schemas.PresignedUrlResponse}})
+async def get_presigned_upload_url(
+    object_path: str,
+    expires: int = Query(3600, description="URL expiration in seconds", ge=60, le=604800),
+    storage: StorageManager = Depends(get_storage)
+):
+    """
+    Generate a presigned URL for uploading directly to MinIO with an HTTP PUT.
+
+    - **object_path**: Path in storage
+    - **expires**: URL expiration time in seconds (60 to 604800, default 3600)
+    """
+    try:
+        url = await asyncio.to_thread(storage.get_presigned_upload_url, object_path, expires)
+        return {
+            "success": True,
+            "object_path": object_path,
+            "url": url,
+            "expires_in_seconds": expires
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate URL: {str(e)}")
+
+
+@app.delete("/delete/{object_path:path}", responses={200: {"model": schemas.DeleteResponse}})
+async def delete_object(object_path: str, storage: StorageManager = Depends(get_storage)):
     """
     Delete an object from storage.
 
     - **object_path**: Path in storage to delete
     """
     try:
-        success = storage_manager.delete_object(object_path)
+        success = await asyncio.to_thread(storage.delete_object, object_path)
         if not success:
-            return schemas.DeleteResponse(
-                success=False,
-                object_path=object_path,
-                message="Failed to delete object or object not found"
-            )
-
-        return schemas.DeleteResponse(
-            success=True,
-            object_path=object_path,
-            message="Object deleted successfully"
-        )
+            return {
+                "success": False,
+                "object_path": object_path,
+                "message": "Failed to delete object or object not found"
+            }
+
+        return {
+            "success": True,
+            "object_path": object_path,
+            "message": "Object deleted successfully"
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
 
 
-@app.get("/list", response_model=schemas.ListResponse)
-async def list_objects(prefix: str = Query("", description="Filter by prefix")):
+def _bulk_delete_response(requested: int, errors: list) -> dict:
+    """Build the response shared by the bulk delete endpoints."""
+    return {
+        "success": not errors,
+        "requested": requested,
+        "errors": errors,
+        "message": f"Deleted {requested - len(errors)} of {requested} objects"
+    }
+
+
+@app.post("/delete-bulk", responses={200: {"model": schemas.BulkDeleteResponse}})
+async def delete_bulk(request: schemas.BulkDeleteRequest, storage: StorageManager = Depends(get_storage)):
+    """
+    Delete several objects from storage with batched requests.
+
+    - **object_paths**: Paths in storage to delete
+    """
+    try:
+        requested, errors = await asyncio.to_thread(storage.delete_objects, request.object_paths)
+        return _bulk_delete_response(requested, errors)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+
+
+@app.delete("/delete-prefix/{prefix:path}", responses={200: {"model": schemas.BulkDeleteResponse}})
+async def delete_prefix(prefix: str, storage: StorageManager = Depends(get_storage)):
+    """
+    Delete every object under a prefix.
+
+    If listing fails part-way, the request fails with a 500; objects deleted
+    before the failure stay deleted, so the call can simply be repeated.
+
+    - **prefix**: Prefix to delete (e.g., "transcripts/job-id/")
+    """
+    if not prefix:
+        raise HTTPException(status_code=400, detail="Prefix must not be empty")
+
+    try:
+        requested, errors = await asyncio.to_thread(storage.delete_prefix, prefix)
+        return _bulk_delete_response(requested, errors)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+
+
+@app.get("/list", responses={200: {"model": schemas.ListResponse}})
+async def list_objects(
+    prefix: str = Query("", description="Filter by prefix"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of objects to return"),
+    start_after: str = Query("", description="Only list objects after this name"),
+    storage: StorageManager = Depends(get_storage)
+):
     """
     List objects in storage with optional prefix filter.
 
+    The response is streamed while MinIO pages through the bucket. When `limit` is
+    reached, pass the returned `next_start_after` as `start_after` to get the next page.
+
     - **prefix**: Optional prefix to filter objects (e.g., "transcripts/job-id/")
+    - **limit**: Optional maximum number of objects to return
+    - **start_after**: Optional object name to continue listing after
     """
+    names = storage.list_objects(prefix, start_after)
+    if limit is not None:
+        names = islice(names, limit)
+
+    # Fetch the first page up front so a failing listing still produces a 500
     try:
-        objects = storage_manager.list_objects(prefix)
-        return schemas.ListResponse(
-            success=True,
-            prefix=prefix,
-            objects=objects,
-            count=len(objects)
-        )
+        first_page = await asyncio.to_thread(lambda: list(islice(names, LIST_PAGE_SIZE)))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"List failed: {str(e)}")
 
+    def body():
+        yield b'{"success":true,"prefix":' + orjson.dumps(prefix) + b',"objects":['
+        page, count, last = first_page, 0, None
+        while page:
+            yield (b',' if count else b'') + b','.join(orjson.dumps(name) for name in page)
+            count += len(page)
+            last = page[-1]
+            try:
+                page = list(islice(names, LIST_PAGE_SIZE))
+            except Exception:
+                # Headers are already sent; abort the stream so the client gets an
+                # incomplete body rather than a listing that looks complete
+                logger.exception("Listing %r failed after %d objects", prefix, count)
+                raise
+        next_start_after = last if limit is not None and count == limit else None
+        yield b'],"count":%d,"next_start_after":%s}' % (count, orjson.dumps(next_start_after))
 
-@app.get("/exists/{object_path:path}", response_model=schemas.ExistsResponse)
-async def check_exists(object_path: str):
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.get("/exists/{object_path:path}", responses={200: {"model": schemas.ExistsResponse}})
+async def check_exists(object_path: str, storage: StorageManager = Depends(get_storage)):
     """
     Check if an object exists in storage.
 
     - **object_path**: Path in storage to check
     """
     try:
-        exists = storage_manager.object_exists(object_path)
-        return schemas.ExistsResponse(
-            exists=exists,
-            object_path=object_path
-        )
+        exists = await asyncio.to_thread(storage.object_exists, object_path)
+        return {
+            "exists": exists,
+            "object_path": object_path
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Check failed: {str(e)}")
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(storage: StorageManager = Depends(get_storage)):
     """
     Comprehensive health check including MinIO connectivity.
     """
     try:
-        # Test MinIO connection
-        bucket_exists = storage_manager.client.bucket_exists(settings.MINIO_BUCKET)
+        # Bucket state is cached after the first successful check, so health
+        # probes don't cost a MinIO round-trip each
+        bucket_exists = await asyncio.to_thread(storage.bucket_ready)
 
         logger.info("Health check: Storage service is healthy")
         return {
@@ -188,7 +380,7 @@ async def health_check():
         }
     except Exception as e:
         logger.error(f"Health check: Storage service is unhealthy - {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -201,5 +393,16 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    # Each worker runs its own lifespan, so it gets its own StorageManager and
+    # connection pool; WEB_CONCURRENCY is also what the uvicorn CLI reads
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8002,
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="info"
+    )
@@ -39,12 +39,33 @@ class DeleteResponse(BaseModel):
     message: str
 
 
+class BulkDeleteRequest(BaseModel):
+    """Request schema for deleting several objects."""
+    object_paths: List[str] = Field(..., description="Paths in storage bucket to delete")
+
+
+class DeleteError(BaseModel):
+    """A single object that could not be deleted."""
+    object_path: str
+    code: str
+    message: str
+
+
+class BulkDeleteResponse(BaseModel):
+    """Response schema for bulk delete operations."""
+    success: bool
+    requested: int
+    errors: List[DeleteError]
+    message: str
+
+
 class ListResponse(BaseModel):
     """Response schema for listing objects."""
     success: bool
     prefix: str
     objects: List[str]
     count: int
+    next_start_after: Optional[str] = None
 
 
 class ExistsResponse(BaseModel):
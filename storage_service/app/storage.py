@@ -1,32 +1,112 @@
-import json
 import io
-from typing import Optional
+import os
+import threading
+import time
+import certifi
+import orjson
+import urllib3
+import zstandard
+from cachetools import TLRUCache, TTLCache
+from typing import Iterable, Iterator, List, Optional, Tuple
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from .config import settings
 
 
+# Bytes read from MinIO per chunk when streaming an object
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# zstandard contexts must not be shared between threads, so each I/O thread keeps its own
+_zstd = threading.local()
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    """Compress bytes with this thread's zstd compressor."""
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL)
+    return _zstd.compressor.compress(data)
+
+
+def _is_zstd(response) -> bool:
+    """Whether an object response carries a zstd-compressed body."""
+    return response.headers.get("Content-Encoding", "").lower() == "zstd"
+
+
 class StorageManager:
     """Manages MinIO object storage operations."""
 
     def __init__(self):
+        # Bound once; every operation below needs it
+        self._bucket = settings.MINIO_BUCKET
+
+        # Own the connection pool so it can be sized for the I/O thread pool and
+        # closed on shutdown; otherwise threads beyond minio's default of 10
+        # connections keep opening and discarding sockets
+        self._http = urllib3.PoolManager(
+            num_pools=10,
+            maxsize=settings.IO_THREADS,
+            block=False,
+            timeout=urllib3.Timeout(connect=2.0, read=30.0),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.1,
+                status_forcelist=[500, 502, 503, 504]
+            ),
+            cert_reqs='CERT_REQUIRED',
+            ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where()
+        )
         self.client = Minio(
             settings.MINIO_ENDPOINT,
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
-            secure=settings.MINIO_SECURE
+            secure=settings.MINIO_SECURE,
+            http_client=self._http
         )
+        # Short-lived caches for hot existence checks and presigned URLs, shared
+        # by the I/O threads. Only objects found to exist are cached: a missing
+        # object may be uploaded through another worker or a presigned URL at any time.
+        self._exists_cache = TTLCache(maxsize=10000, ttl=settings.EXISTS_CACHE_TTL)
+        self._presigned_cache = TLRUCache(
+            maxsize=10000,
+            ttu=lambda key, url, now: now + self.presigned_url_cache_ttl(key[1])
+        )
+        self._cache_lock = threading.Lock()
+
+        self._bucket_verified = False
+        self._bucket_checked_at = 0.0
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self):
         """Ensure the storage bucket exists, create if not."""
+        self._bucket_checked_at = time.monotonic()
         try:
-            if not self.client.bucket_exists(settings.MINIO_BUCKET):
-                self.client.make_bucket(settings.MINIO_BUCKET)
-                print(f"Created bucket: {settings.MINIO_BUCKET}")
+            if not self.client.bucket_exists(self._bucket):
+                self.client.make_bucket(self._bucket)
+                print(f"Created bucket: {self._bucket}")
+            self._bucket_verified = True
         except S3Error as e:
             print(f"Error ensuring bucket exists: {e}")
 
+    def bucket_ready(self) -> bool:
+        """
+        Report whether the bucket has been verified, without a MinIO round-trip.
+
+        Once the bucket is verified the cached flag is returned as-is; until then
+        the check is retried at most every BUCKET_RECHECK_SECONDS.
+
+        Returns:
+            True if the bucket exists
+        """
+        if not self._bucket_verified and \
+                time.monotonic() - self._bucket_checked_at >= settings.BUCKET_RECHECK_SECONDS:
+            self._ensure_bucket_exists()
+        return self._bucket_verified
+
+    def close(self):
+        """Close all pooled connections to MinIO."""
+        self._http.clear()
+
     def upload_json(self, object_path: str, data: dict) -> str:
         """
         Upload JSON data to storage.
@@ -38,18 +118,30 @@ class StorageManager:
         Returns:
             Full path to stored object
         """
-        json_data = json.dumps(data, indent=2)
-        json_bytes = json_data.encode('utf-8')
+        json_bytes = orjson.dumps(data)
+
+        # Transcripts compress several-fold; tiny payloads aren't worth the framing
+        metadata = None
+        if len(json_bytes) >= settings.COMPRESS_MIN_BYTES:
+            json_bytes = _zstd_compress(json_bytes)
+            metadata = {"Content-Encoding": "zstd"}
 
         self.client.put_object(
-            settings.MINIO_BUCKET,
+            self._bucket,
             object_path,
             data=io.BytesIO(json_bytes),
             length=len(json_bytes),
-            content_type='application/json'
+            content_type='application/json',
+            metadata=metadata,
+            # Payloads up to one part are sent as a single PUT; larger ones are
+            # split into parts that upload concurrently
+            part_size=settings.UPLOAD_PART_SIZE,
+            num_parallel_uploads=settings.UPLOAD_PARALLEL_PARTS
         )
+        with self._cache_lock:
+            self._exists_cache[object_path] = True
 
-        return f"{settings.MINIO_BUCKET}/{object_path}"
+        return f"{self._bucket}/{object_path}"
 
     def download_json(self, object_path: str) -> Optional[dict]:
         """
@@ -61,19 +153,109 @@ class StorageManager:
         Returns:
             Parsed JSON as dictionary, or None if not found
         """
+        response = None
         try:
-            response = self.client.get_object(settings.MINIO_BUCKET, object_path)
-            data = response.read()
-            return json.loads(data.decode('utf-8'))
+            response = self.client.get_object(self._bucket, object_path)
+            # Grow one buffer chunk by chunk (decompressing as we go) rather than
+            # holding the whole body and its decoded copy at once. Decode ourselves;
+            # urllib3 may otherwise try to undo Content-Encoding too.
+            decompressor = zstandard.ZstdDecompressor().decompressobj() if _is_zstd(response) else None
+            buf = bytearray()
+            for chunk in response.stream(STREAM_CHUNK_SIZE, decode_content=False):
+                buf += decompressor.decompress(chunk) if decompressor else chunk
+            return orjson.loads(buf)
         except S3Error as e:
             if e.code == 'NoSuchKey':
                 return None
             raise
         finally:
-            if 'response' in locals():
+            if response is not None:
                 response.close()
                 response.release_conn()
 
+    def open_object(self, object_path: str):
+        """
+        Open an object for streaming without reading it into memory.
+
+        Args:
+            object_path: Path in bucket
+
+        Returns:
+            The open HTTP response, or None if not found. The caller must pass it
+            to release_object once done, even if it was never read.
+        """
+        try:
+            return self.client.get_object(self._bucket, object_path)
+        except S3Error as e:
+            if e.code == 'NoSuchKey':
+                return None
+            raise
+
+    @staticmethod
+    def release_object(response) -> None:
+        """
+        Close an object response and return its connection to the pool.
+        Safe to call more than once.
+
+        Args:
+            response: Response returned by open_object
+        """
+        response.close()
+        response.release_conn()
+
+    @staticmethod
+    def is_zstd(response) -> bool:
+        """
+        Check whether an open object was stored zstd-compressed.
+
+        Args:
+            response: Response returned by open_object
+
+        Returns:
+            True if the object has Content-Encoding: zstd
+        """
+        return _is_zstd(response)
+
+    @staticmethod
+    def iter_object(response, chunk_size: int = STREAM_CHUNK_SIZE, decompress: bool = True) -> Iterator[bytes]:
+        """
+        Yield an open object's bytes in chunks, releasing the connection afterwards.
+
+        Args:
+            response: Response returned by open_object
+            chunk_size: Bytes per chunk (default 64 KiB)
+            decompress: Decompress objects stored compressed (default True)
+
+        Yields:
+            Object bytes, as stored if decompress is False
+        """
+        try:
+            chunks = response.stream(chunk_size, decode_content=False)
+            if not decompress or not _is_zstd(response):
+                yield from chunks
+                return
+
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            for chunk in chunks:
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+        finally:
+            StorageManager.release_object(response)
+
+    @staticmethod
+    def presigned_url_cache_ttl(expires_seconds: int) -> int:
+        """
+        Seconds a presigned URL may be reused, keeping at least 90% of its lifetime.
+
+        Args:
+            expires_seconds: URL expiration time in seconds
+
+        Returns:
+            Cache lifetime in seconds
+        """
+        return min(settings.PRESIGNED_URL_CACHE_TTL, expires_seconds // 10)
+
     def get_presigned_url(self, object_path: str, expires_seconds: int = 3600) -> str:
         """
         Generate a presigned URL for direct download.
@@ -85,14 +267,40 @@ class StorageManager:
         Returns:
             Presigned URL
         """
+        key = (object_path, expires_seconds)
+        with self._cache_lock:
+            url = self._presigned_cache.get(key)
+        if url is not None:
+            return url
+
         from datetime import timedelta
         url = self.client.presigned_get_object(
-            settings.MINIO_BUCKET,
+            self._bucket,
             object_path,
             expires=timedelta(seconds=expires_seconds)
         )
+        with self._cache_lock:
+            self._presigned_cache[key] = url
         return url
 
+    def get_presigned_upload_url(self, object_path: str, expires_seconds: int = 3600) -> str:
+        """
+        Generate a presigned URL for uploading an object directly to MinIO.
+
+        Args:
+            object_path: Path in bucket
+            expires_seconds: URL expiration time in seconds (default 1 hour)
+
+        Returns:
+            Presigned PUT URL
+        """
+        from datetime import timedelta
+        return self.client.presigned_put_object(
+            self._bucket,
+            object_path,
+            expires=timedelta(seconds=expires_seconds)
+        )
+
     def delete_object(self, object_path: str) -> bool:
         """
         Delete an object from storage.
@@ -103,31 +311,87 @@ class StorageManager:
         Returns:
             True if successful
         """
+        with self._cache_lock:
+            self._exists_cache.pop(object_path, None)
         try:
-            self.client.remove_object(settings.MINIO_BUCKET, object_path)
+            self.client.remove_object(self._bucket, object_path)
             return True
         except S3Error:
             return False
 
-    def list_objects(self, prefix: str = "") -> list:
+    def _remove_objects(self, object_paths: Iterable[str]) -> Tuple[int, List[dict]]:
         """
-        List objects in storage with optional prefix.
+        Delete objects with batched DeleteObjects requests (up to 1000 keys each).
 
         Args:
-            prefix: Filter by prefix (e.g., "transcripts/job-id/")
+            object_paths: Paths in bucket, consumed lazily
 
         Returns:
-            List of object names
+            Tuple of (number of objects requested, list of per-object errors)
         """
-        try:
-            objects = self.client.list_objects(
-                settings.MINIO_BUCKET,
-                prefix=prefix,
-                recursive=True
-            )
-            return [obj.object_name for obj in objects]
-        except S3Error:
-            return []
+        count = 0
+
+        def delete_requests():
+            nonlocal count
+            for object_path in object_paths:
+                count += 1
+                with self._cache_lock:
+                    self._exists_cache.pop(object_path, None)
+                yield DeleteObject(object_path)
+
+        errors = [
+            {"object_path": error.name, "code": error.code, "message": error.message}
+            for error in self.client.remove_objects(self._bucket, delete_requests())
+        ]
+        return count, errors
+
+    def delete_objects(self, object_paths: List[str]) -> Tuple[int, List[dict]]:
+        """
+        Delete several objects from storage in as few requests as possible.
+
+        Args:
+            object_paths: Paths in bucket
+
+        Returns:
+            Tuple of (number of objects requested, list of per-object errors)
+        """
+        return self._remove_objects(object_paths)
+
+    def delete_prefix(self, prefix: str) -> Tuple[int, List[dict]]:
+        """
+        Delete every object under a prefix, streaming the listing into batched deletes.
+
+        Args:
+            prefix: Prefix to delete (e.g., "transcripts/job-id/")
+
+        Returns:
+            Tuple of (number of objects requested, list of per-object errors)
+        """
+        return self._remove_objects(self.list_objects(prefix))
+
+    def list_objects(self, prefix: str = "", start_after: str = "") -> Iterator[str]:
+        """
+        List objects in storage with optional prefix, fetching pages lazily.
+
+        Args:
+            prefix: Filter by prefix (e.g., "transcripts/job-id/")
+            start_after: Only list objects whose names sort after this one
+
+        Yields:
+            Object names
+
+        Raises:
+            S3Error: If MinIO fails at any point of the listing, so callers
+                never mistake a partial listing for a complete one
+        """
+        objects = self.client.list_objects(
+            self._bucket,
+            prefix=prefix,
+            recursive=True,
+            start_after=start_after or None
+        )
+        for obj in objects:
+            yield obj.object_name
 
     def object_exists(self, object_path: str) -> bool:
         """
@@ -139,12 +403,14 @@ class StorageManager:
         Returns:
             True if object exists
         """
+        with self._cache_lock:
+            if object_path in self._exists_cache:
+                return True
+
         try:
-            self.client.stat_object(settings.MINIO_BUCKET, object_path)
-            return True
+            self.client.stat_object(self._bucket, object_path)
         except S3Error:
             return False
-
-
-# Global storage manager instance
-storage_manager = StorageManager()
+        with self._cache_lock:
+            self._exists_cache[object_path] = True
+        return True